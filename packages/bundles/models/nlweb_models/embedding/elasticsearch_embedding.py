@@ -8,12 +8,18 @@ WARNING: This code is under development and may undergo changes in future releas
 Backwards compatibility is not guaranteed at this time.
 """
 
+import asyncio
+import weakref
 from typing import List, Optional, Union, Dict
 
 from elasticsearch import AsyncElasticsearch, NotFoundError
 from nlweb_core.config import CONFIG
 
 
+# One shared embedder per event loop, created on first use
+_embedders = weakref.WeakKeyDictionary()
+
+
 class ElasticsearchEmbedding:
     def __init__(self,  endpoint_name: Optional[str] = None):
         self.endpoint_name = endpoint_name or CONFIG.preferred_embedding_provider
@@ -179,3 +185,52 @@ class ElasticsearchEmbedding:
             return embeddings
         except Exception as e:
             raise
+
+
+async def get_embedder() -> ElasticsearchEmbedding:
+    """
+    Get the shared ElasticsearchEmbedding for the running event loop.
+
+    The instance (and its AsyncElasticsearch connection pool) is created once
+    and reused by every request instead of being opened and closed per call.
+    """
+    loop = asyncio.get_running_loop()
+    # Construction does not await, so no other coroutine can race us here
+    embedder = _embedders.get(loop)
+    if embedder is None:
+        embedder = ElasticsearchEmbedding()
+        _embedders[loop] = embedder
+    return embedder
+
+
+async def close_embedder(*args) -> None:
+    """Close the shared embedder for the running event loop, if any."""
+    embedder = _embedders.pop(asyncio.get_running_loop(), None)
+    if embedder is not None:
+        await embedder.close()
+
+
+async def get_elasticsearch_embedding(
+    text: str,
+    model: Optional[str] = None,
+    timeout: float = 30.0
+) -> Union[List[float], Dict[str,float]]:
+    """
+    Generate an embedding for a single text using the shared embedder.
+    Use this function as the class_name in the embedding config.
+    """
+    embedder = await get_embedder()
+    return await embedder.get_embeddings(text, model=model, timeout=timeout)
+
+
+async def get_elasticsearch_batch_embeddings(
+    texts: List[str],
+    model: Optional[str] = None,
+    timeout: float = 60.0
+) -> List[Union[List[float], Dict[str,float]]]:
+    """
+    Generate embeddings for multiple texts using the shared embedder.
+    Use this function as the batch_class_name in the embedding config.
+    """
+    embedder = await get_embedder()
+    return await embedder.get_batch_embeddings(texts, model=model, timeout=timeout)
@@ -12,11 +12,11 @@ import os
 import requests
 import json
 import re
-import aiohttp
 import asyncio
 import threading
 from typing import Dict, Any, Optional
 
+from nlweb_core.http_client import get_http_client
 from nlweb_core.llm import LLMProvider
 
 
@@ -46,10 +46,10 @@ class InceptionProvider(LLMProvider):
     @classmethod
     def get_client(cls):
         """
-        Inception uses direct HTTP calls, so there's no persistent client.
-        This method is implemented to satisfy the interface but returns None.
+        Inception uses direct HTTP calls through the shared pooled client,
+        so connections are reused across requests.
         """
-        return None
+        return get_http_client()
 
     @classmethod
     def clean_response(cls, content: str) -> Dict[str, Any]:
@@ -115,21 +115,20 @@ class InceptionProvider(LLMProvider):
             payload["diffusing"] = True
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.API_URL, 
-                    headers=HEADERS, 
-                    json=payload, 
-                    timeout=timeout
-                ) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    content = data["choices"][0]["message"]["content"]
-                    
-                    # If schema was provided, parse the response as JSON
-                    if schema:
-                        return self.clean_response(content)
-                    return content
+            resp = await self.get_client().post(
+                self.API_URL,
+                headers=HEADERS,
+                json=payload,
+                timeout=timeout
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            content = data["choices"][0]["message"]["content"]
+
+            # If schema was provided, parse the response as JSON
+            if schema:
+                return self.clean_response(content)
+            return content
         except Exception as e:
             # Log the error and return empty response
             import logging
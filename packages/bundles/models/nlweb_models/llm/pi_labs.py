@@ -1,25 +1,56 @@
 import asyncio
-import threading
+import csv
+import itertools
+import time
 from typing import Any
 import httpx
 import json
+import orjson
 
 from nlweb_core.llm import LLMProvider
 
+# Number of scoring requests in flight at once in pi_scoring_comparison
+EVAL_CONCURRENCY = 10
+
+# Items sent per scoring request by pi_scoring_comparison. Values above 1 use
+# PiLabsClient.score_batch and need an endpoint that accepts a list payload.
+EVAL_BATCH_SIZE = 1
+
+# Scoring spec used by the eval
+_EVAL_SCORING_SPEC = [
+    {"question": "Is the item relevant to the query?"},
+]
+
+# Serialized schema objects keyed by item url, reused when a url is rescored
+_schema_dumps: dict[str, str] = {}
+
+# HTTP clients shared by every PiLabsClient for the same url, created lazily
+_http_clients: dict[str, httpx.AsyncClient] = {}
+_http_clients_lock = asyncio.Lock()
+
 
 class PiLabsClient:
     """PiLabsClient accesses a Pi Labs scoring API.
-    It lazily initializes the client it will use to make requests."""
+    It lazily fetches the HTTP client it will use to make requests, shared
+    with any other PiLabsClient pointed at the same url."""
 
-    _client: httpx.AsyncClient
     _url: str
 
     def __init__(self, url: str = "http://localhost:8001/invocations"):
         self._url = url
-        self._client = httpx.AsyncClient(
-            http2=True,
-            limits=httpx.Limits(max_connections=100, max_keepalive_connections=30),
-        )
+
+    async def _get_http(self) -> httpx.AsyncClient:
+        client = _http_clients.get(self._url)
+        if client is None:
+            async with _http_clients_lock:
+                client = _http_clients.get(self._url)
+                if client is None:
+                    client = httpx.AsyncClient(
+                        http2=True,
+                        limits=httpx.Limits(max_connections=100, max_keepalive_connections=30),
+                    )
+                    _http_clients[self._url] = client
+        return client
 
     async def score(
         self,
@@ -28,7 +59,8 @@ class PiLabsClient:
         scoring_spec: list[dict[str, Any]],
         timeout: float = 30.0,
     ) -> float:
-        resp = await self._client.post(
+        http = await self._get_http()
+        resp = await http.post(
             url=self._url,
             json={
                 "llm_input": llm_input,
@@ -40,20 +72,58 @@ class PiLabsClient:
         resp.raise_for_status()
         return resp.json().get("total_score", 0) * 100
 
+    async def score_batch(
+        self,
+        pairs: list[tuple[str, str]],
+        scoring_spec: list[dict[str, Any]],
+        timeout: float = 30.0,
+    ) -> list[float]:
+        """Score several (llm_input, llm_output) pairs in one request.
+        The endpoint must accept a list of score payloads and return one
+        result per pair, in the same order."""
+        http = await self._get_http()
+        resp = await http.post(
+            url=self._url,
+            json=[
+                {
+                    "llm_input": llm_input,
+                    "llm_output": llm_output,
+                    "scoring_spec": scoring_spec,
+                }
+                for llm_input, llm_output in pairs
+            ],
+            timeout=timeout,
+        )
+        resp.raise_for_status()
+        return [result.get("total_score", 0) * 100 for result in resp.json()]
+
 
 class PiLabsProvider(LLMProvider):
     """PiLabsProvider accesses a Pi Labs scoring API."""
 
-    _client_lock = threading.Lock()
+    _client_lock = asyncio.Lock()
     _client: PiLabsClient | None = None
 
     @classmethod
-    def get_client(cls) -> PiLabsClient:
-        with cls._client_lock:
-            if cls._client is None:
-                cls._client = PiLabsClient()
+    async def get_client(cls) -> PiLabsClient:
+        # Only take the lock while the client has not been created yet
+        if cls._client is None:
+            async with cls._client_lock:
+                if cls._client is None:
+                    cls._client = PiLabsClient()
         return cls._client
 
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared connection pools, e.g. from a shutdown hook."""
+        async with cls._client_lock:
+            cls._client = None
+        async with _http_clients_lock:
+            clients = list(_http_clients.values())
+            _http_clients.clear()
+        for client in clients:
+            await client.aclose()
+
     async def get_completion(
         self,
         prompt: str,
@@ -72,7 +142,7 @@ class PiLabsProvider(LLMProvider):
             raise ValueError(
                 "PiLabsProvider requires 'request.query', 'site.itemType', and 'item.description' in kwargs."
             )
-        client = self.get_client()
+        client = await self.get_client()
         score = await client.score(
             llm_input=kwargs["request.query"].text,
             llm_output=json.dumps(kwargs["item.description"]),
@@ -88,35 +158,76 @@ class PiLabsProvider(LLMProvider):
         raise NotImplementedError("PiLabsProvider does not support clean_response.")
 
 
+def _load_items(file):
+    """Parse a JSONL file, skipping blank and malformed lines."""
+    # orjson parses bytes directly, so read the file in binary mode line by line
+    data = []
+    with open(file, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                data.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                continue
+    return data
+
+
 async def pi_scoring_comparison(file):
     # Generate output filename
     base_name = file.rsplit(".", 1)[0] if "." in file else file
     output_file = f"{base_name}_pi_eval.csv"
-    client = PiLabsProvider.get_client()
+    client = await PiLabsProvider.get_client()
 
-    with open(file, "r") as f:
-        lines = f.readlines()
-        data = []
-        for line in lines:
-            try:
-                data.append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
+    # Read off the event loop so a large input does not stall it
+    data = await asyncio.to_thread(_load_items, file)
 
-    tasks = []
-    async with asyncio.TaskGroup() as tg:
-        for item in data:
-            tasks.append(tg.create_task(process_item(item, client)))
+    # Rows are written as items finish scoring rather than after all of them
+    queue = asyncio.Queue(maxsize=256)
 
-    with open(output_file, "a") as f:
-        for task in tasks:
-            score, pi_score, csv_line = task.result()
-            if score > 64 or pi_score > 30:
-                print(csv_line)
-            f.write(csv_line + "\n")
+    async def write_rows(f):
+        # csv.writer quotes fields that contain commas, e.g. in queries or names
+        csv_writer = csv.writer(f, lineterminator="\n")
+        done = False
+        while not done:
+            # Write whatever has queued up in one call made off the event loop
+            rows = [await queue.get()]
+            while not queue.empty():
+                rows.append(queue.get_nowait())
+            if rows[-1] is None:
+                rows.pop()
+                done = True
+            if rows:
+                await asyncio.to_thread(csv_writer.writerows, rows)
 
+    # Workers pull batches from one shared iterator, so at most EVAL_CONCURRENCY
+    # requests are in flight no matter how large the input is
+    items = iter(data)
 
-async def process_item(item, client):
+    async def score_items():
+        while batch := list(itertools.islice(items, EVAL_BATCH_SIZE)):
+            if len(batch) == 1:
+                results = [await process_item(batch[0], client)]
+            else:
+                results = await process_batch(batch, client)
+            for _, _, csv_fields in results:
+                await queue.put(csv_fields)
+
+    async def score_all():
+        async with asyncio.TaskGroup() as workers:
+            for _ in range(EVAL_CONCURRENCY):
+                workers.create_task(score_items())
+        await queue.put(None)
+
+    # One group for the writer and the workers: if either fails the other is
+    # cancelled, so workers never block forever on a queue nothing drains
+    with open(output_file, "a", newline="") as f:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(write_rows(f))
+            tg.create_task(score_all())
+
+
+def _item_fields(item):
     item_fields = {
         "url": item.get("url", ""),
         "name": item.get("name", ""),
@@ -127,22 +238,57 @@ async def process_item(item, client):
         "schema_object": item.get("schema_object", {}),
         "query": item.get("query", ""),
     }
-    desc = json.dumps(item_fields["schema_object"])
-    pi_score, time_taken = await client.score(
-        item["query"],
-        desc,
-        scoring_spec=[
-            {"question": "Is the item relevant to the query?"},
-        ],
-    )
+    url = item_fields["url"]
+    desc = _schema_dumps.get(url) if url else None
+    if desc is None:
+        desc = orjson.dumps(item_fields["schema_object"]).decode()
+        if url:
+            _schema_dumps[url] = desc
+    return item_fields, desc
+
+
+def _record_score(item, item_fields, pi_score, time_taken):
     score = item_fields["score"]
 
     item["ranking"]["score"] = pi_score
-    csv_line = f"O={score},P={pi_score},T={time_taken},Q={item_fields['query']},N={item_fields['name']}"  # ,D={item_fields['description']}"
+    csv_fields = (
+        "O=" + str(score),
+        "P=" + str(pi_score),
+        "T=" + str(time_taken),
+        "Q=" + str(item_fields["query"]),
+        "N=" + str(item_fields["name"]),
+    )  # "D=" + str(item_fields["description"])
 
     if score > 64 or pi_score > 30:
-        print(csv_line)
-    return score, pi_score, csv_line
+        print(",".join(csv_fields))
+    return score, pi_score, csv_fields
+
+
+async def process_item(item, client):
+    item_fields, desc = _item_fields(item)
+    start = time.perf_counter()
+    pi_score = await client.score(
+        item["query"],
+        desc,
+        scoring_spec=_EVAL_SCORING_SPEC,
+    )
+    time_taken = time.perf_counter() - start
+    return _record_score(item, item_fields, pi_score, time_taken)
+
+
+async def process_batch(batch, client):
+    """Score a batch of items in one request. T is the time of the whole request."""
+    prepared = [_item_fields(item) for item in batch]
+    start = time.perf_counter()
+    pi_scores = await client.score_batch(
+        [(item["query"], desc) for item, (_, desc) in zip(batch, prepared)],
+        scoring_spec=_EVAL_SCORING_SPEC,
+    )
+    time_taken = time.perf_counter() - start
+    return [
+        _record_score(item, item_fields, pi_score, time_taken)
+        for item, (item_fields, _), pi_score in zip(batch, prepared, pi_scores)
+    ]
 
 
 if __name__ == "__main__":
@@ -153,4 +299,11 @@ if __name__ == "__main__":
         sys.exit(1)
 
     input_file = sys.argv[1]
-    asyncio.run(pi_scoring_comparison(input_file))
+
+    async def main():
+        try:
+            await pi_scoring_comparison(input_file)
+        finally:
+            await PiLabsProvider.aclose()
+
+    asyncio.run(main())
@@ -16,10 +16,10 @@ Backwards compatibility is not guaranteed at this time.
 import json
 import re
 import logging
-import httpx
 from typing import Dict, Any, List, Optional
 
 from nlweb_core.config import CONFIG
+from nlweb_core.http_client import get_http_client
 from nlweb_core.llm import LLMProvider
 from nlweb_retrieval.utils import snowflake
 
@@ -122,22 +122,22 @@ async def cortex_complete(
 
 async def post(api: str, request: dict, timeout: float) -> dict:
     cfg = CONFIG.llm_endpoints.get("snowflake")
-    async with httpx.AsyncClient() as client:
-        response =  await client.post(
-            snowflake.get_account_url(cfg) + api,
-            json=request,
-            headers={
-                    "Authorization": f"Bearer {snowflake.get_pat(cfg)}",
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-            },
-            timeout=timeout,
-        )
-        if response.status_code == 400:
-            return {}
-        try:
-            response.raise_for_status()
-        except Exception as e:
-            return {}
-        return response.json()
+    client = get_http_client()
+    response =  await client.post(
+        snowflake.get_account_url(cfg) + api,
+        json=request,
+        headers={
+                "Authorization": f"Bearer {snowflake.get_pat(cfg)}",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+        },
+        timeout=timeout,
+    )
+    if response.status_code == 400:
+        return {}
+    try:
+        response.raise_for_status()
+    except Exception as e:
+        return {}
+    return response.json()
 
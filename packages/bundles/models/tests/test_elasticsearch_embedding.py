@@ -0,0 +1,36 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+Tests for the shared Elasticsearch embedder
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from nlweb_models.embedding import elasticsearch_embedding
+
+
+def test_close_embedder_closes_client_and_forgets_it():
+    """Test that close_embedder closes the loop's client and drops the embedder."""
+    es_client = MagicMock()
+    es_client.close = AsyncMock()
+
+    # Skip __init__, which needs a configured Elasticsearch endpoint
+    embedder = elasticsearch_embedding.ElasticsearchEmbedding.__new__(
+        elasticsearch_embedding.ElasticsearchEmbedding
+    )
+    embedder._client = es_client
+
+    async def run():
+        with patch.object(elasticsearch_embedding, "ElasticsearchEmbedding", return_value=embedder):
+            assert await elasticsearch_embedding.get_embedder() is embedder
+            await elasticsearch_embedding.close_embedder()
+
+            loop = asyncio.get_running_loop()
+            return loop in elasticsearch_embedding._embedders
+
+    still_cached = asyncio.run(run())
+
+    es_client.close.assert_awaited_once()
+    assert not still_cached
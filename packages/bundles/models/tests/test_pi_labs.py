@@ -0,0 +1,40 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+Tests for the Pi Labs scoring comparison script
+"""
+
+import asyncio
+
+import pytest
+
+from nlweb_models.llm import pi_labs
+
+
+class FailingCsvWriter:
+    def writerows(self, rows):
+        raise OSError("disk full")
+
+
+def test_writer_failure_stops_the_workers(monkeypatch, tmp_path):
+    """Test that a failed CSV write ends the run instead of leaving workers blocked on the queue."""
+    input_file = tmp_path / "items.jsonl"
+    input_file.write_text("{}\n" * 1000)
+
+    async def fake_get_client():
+        return None
+
+    async def fake_process_item(item, client):
+        return 0, 0, ("O=0",)
+
+    monkeypatch.setattr(pi_labs.PiLabsProvider, "get_client", fake_get_client)
+    monkeypatch.setattr(pi_labs, "process_item", fake_process_item)
+    monkeypatch.setattr(pi_labs.csv, "writer", lambda f, **kwargs: FailingCsvWriter())
+
+    async def run():
+        await asyncio.wait_for(pi_labs.pi_scoring_comparison(str(input_file)), timeout=5)
+
+    with pytest.raises(ExceptionGroup) as excinfo:
+        asyncio.run(run())
+    assert excinfo.value.subgroup(OSError) is not None
@@ -6,7 +6,7 @@ Bing Web Search Client - Interface for Bing Web Search API operations.
 Provides read-only access to web search results with site-specific filtering.
 """
 
-import json
+import orjson
 import httpx
 import asyncio
 import re
@@ -319,7 +319,7 @@ class BingSearchClient(VectorDBClientInterface):
             if "displayUrl" in bing_result:
                 schema_obj["displayUrl"] = bing_result["displayUrl"]
         
-        json_str = json.dumps(schema_obj)
+        json_str = orjson.dumps(schema_obj).decode()
         
         return [url, json_str, name, site]
     
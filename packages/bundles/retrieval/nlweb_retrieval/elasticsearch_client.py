@@ -90,6 +90,10 @@ class ElasticsearchClient(VectorDBClientInterface):
         params["hosts"] = self.api_endpoint
         params["api_key"] = self.api_key
 
+        # Size the per-node connection pool if configured
+        if self.endpoint_config.pool_size:
+            params["connections_per_node"] = self.endpoint_config.pool_size
+
         return params
     
     def _create_vector_properties(self):
@@ -9,7 +9,7 @@ import os
 import sys
 import threading
 import asyncio
-import json
+import orjson
 from typing import List, Dict, Union, Optional, Any, Tuple
 
 from pymilvus import MilvusClient
@@ -165,9 +165,9 @@ class MilvusVectorClient(VectorDBClientInterface):
                     ent = item["entity"]
                     try:
                         # Parse text field as JSON
-                        schema_json = json.loads(ent["text"])
+                        schema_json = orjson.loads(ent["text"])
                         retval.append([ent["url"], schema_json, ent["name"], ent["site"]])
-                    except json.JSONDecodeError as e:
+                    except orjson.JSONDecodeError as e:
                         continue
             
             return retval
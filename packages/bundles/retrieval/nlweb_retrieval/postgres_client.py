@@ -157,7 +157,7 @@ class PgVectorClient(VectorDBClientInterface):
                         self._pool = AsyncConnectionPool(
                             conninfo=conninfo,
                             min_size=1,
-                            max_size=10, 
+                            max_size=self.endpoint_config.pool_size or 10,
                             open=False # Don't open immediately, we will do it explicitly later
                         )
                         # Explicitly open the pool as recommended in newer psycopg versions
@@ -7,7 +7,7 @@ This client enables search via MCP endpoints provided by Shopify sites.
 """
 
 import os
-import json
+import orjson
 import aiohttp
 import asyncio
 from typing import List, Dict, Optional, Any, Union
@@ -217,14 +217,14 @@ class ShopifyMCPClient(VectorDBClientInterface):
                             if content_item.get('type') == 'text' and 'text' in content_item:
                                 try:
                                     # Parse the text as JSON
-                                    search_data = json.loads(content_item['text'])
+                                    search_data = orjson.loads(content_item['text'])
                                     formatted = self._format_results(search_data, site)
                                     # Cache the results
                                     _mcp_results_cache[cache_key] = formatted
                                     # Print query and results on one line
                                     print(f"[SHOPIFY_MCP] Query '{query}' to {site}: {len(formatted)} results")
                                     return formatted
-                                except json.JSONDecodeError:
+                                except orjson.JSONDecodeError:
                                     pass
 
                     # Otherwise try direct format
@@ -322,7 +322,7 @@ class ShopifyMCPClient(VectorDBClientInterface):
                 # Format as expected by NLWeb: [url, schema_json, name, site]
                 formatted_result = [
                     product.get('url', ''),  # url
-                    json.dumps(schema_object),  # schema_json
+                    orjson.dumps(schema_object).decode(),  # schema_json
                     product.get('title', ''),  # name
                     site  # site
                 ]
@@ -1,5 +1,5 @@
 import httpx
-import json
+import orjson
 from nlweb_core.config import CONFIG, RetrievalProviderConfig
 from nlweb_core.retriever import VectorDBClientInterface
 from typing import Any, Dict, List, Optional, Tuple, Union
@@ -90,7 +90,7 @@ def _process_result(r: Dict[str, str]) -> List[str]:
 
 def _name_from_schema_json(schema_json: str) -> str:
     try:
-        return json.loads(schema_json).get("name", "")
+        return orjson.loads(schema_json).get("name", "")
     except Exception as e:
         return ""
 
@@ -58,6 +58,7 @@ class EmbeddingProviderConfig:
     auth_method: Optional[str] = None
     import_path: Optional[str] = None
     class_name: Optional[str] = None
+    batch_class_name: Optional[str] = None  # Optional batch callable used to coalesce concurrent requests
 
 @dataclass
 class RetrievalProviderConfig:
@@ -74,6 +75,7 @@ class RetrievalProviderConfig:
     auth_method: Optional[str] = None  # Authentication method (api_key, azure_ad)
     import_path: Optional[str] = None
     class_name: Optional[str] = None
+    pool_size: Optional[int] = None  # Max pooled connections to the backend (provider default if unset)
 @dataclass
 class SSLConfig:
     enabled: bool = False
@@ -181,6 +183,7 @@ class AppConfig:
         self.preferred_embedding_provider = None
         self.retrieval_endpoints = {}
         self.write_endpoint = None
+        self.ranking_concurrency = 16  # Max concurrent LLM calls per ranking request
 
         # Check if using new unified config.yaml format
         unified_config_path = os.path.join(self.config_directory, 'config.yaml')
@@ -284,7 +287,8 @@ class AppConfig:
                     config=self._get_config_value(emb_cfg.get('config')),
                     auth_method=self._get_config_value(emb_cfg.get('auth_method'), 'api_key'),
                     import_path=self._get_config_value(emb_cfg.get('import_path')),
-                    class_name=self._get_config_value(emb_cfg.get('class_name'))
+                    class_name=self._get_config_value(emb_cfg.get('class_name')),
+                    batch_class_name=self._get_config_value(emb_cfg.get('batch_class_name'))
                 )
             }
         else:
@@ -310,7 +314,8 @@ class AppConfig:
                     vector_type=ret_cfg.get('vector_type'),
                     auth_method=self._get_config_value(ret_cfg.get('auth_method'), 'api_key'),
                     import_path=self._get_config_value(ret_cfg.get('import_path')),
-                    class_name=self._get_config_value(ret_cfg.get('class_name'))
+                    class_name=self._get_config_value(ret_cfg.get('class_name')),
+                    pool_size=ret_cfg.get('pool_size')
                 )
             }
             self.write_endpoint = provider_name
@@ -352,6 +357,7 @@ class AppConfig:
         self.mode = config.get('mode', "production")
         self.homepage = config.get('homepage', "static/index.html")
         self.nlweb_gateway = config.get('nlweb_gateway', "nlwm.azurewebsites.net")
+        self.ranking_concurrency = config.get('ranking_concurrency', 16)
 
         # Server config defaults
         server_cfg = config.get('server', {})
@@ -524,7 +530,8 @@ class AppConfig:
                 config=config,
                 auth_method=auth_method,
                 import_path=self._get_config_value(cfg.get("import_path")),
-                class_name=self._get_config_value(cfg.get("class_name"))
+                class_name=self._get_config_value(cfg.get("class_name")),
+                batch_class_name=self._get_config_value(cfg.get("batch_class_name"))
             )
 
     def load_retrieval_config(self, path: str = "config_retrieval.yaml"):
@@ -563,7 +570,8 @@ class AppConfig:
                 use_knn=cfg.get("use_knn"),
                 vector_type=cfg.get("vector_type"),
                 import_path=self._get_config_value(cfg.get("import_path")),
-                class_name=self._get_config_value(cfg.get("class_name"))
+                class_name=self._get_config_value(cfg.get("class_name")),
+                pool_size=cfg.get("pool_size")
             )
     
     def load_webserver_config(self, path: str = "config_webserver.yaml"):
@@ -704,6 +712,9 @@ class AppConfig:
         
         # Load who_endpoint from config
         who_endpoint = self._get_config_value(data.get("who_endpoint"), "http://localhost:8000/who")
+
+        # Load max concurrent LLM calls per ranking request
+        self.ranking_concurrency = self._get_config_value(data.get("ranking_concurrency"), 16)
         
         # Load headers from config
         headers = data.get("headers", {})
@@ -8,12 +8,26 @@ WARNING: This code is under development and may undergo changes in future releas
 Backwards compatibility is not guaranteed at this time.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from nlweb_core.protocol.models import AskRequest, ResultObject
 
 
+# Example message shown in the generated JSON schema
+_MESSAGE_EXAMPLE = {
+    "message_id": "msg_123456",
+    "conversation_id": "conv_abc123",
+    "role": "user",
+    "timestamp": "2025-01-15T10:30:00Z",
+    "request": {
+        "query": {"text": "best pizza in Seattle"},
+        "prefer": {"streaming": True, "response_format": "conv_search"}
+    },
+    "metadata": {"site": "yelp.com"}
+}
+
+
 class ConversationMessage(BaseModel):
     """
     A message in a conversation (user query or assistant response).
@@ -21,6 +35,9 @@ class ConversationMessage(BaseModel):
     This model stores the complete context of a message exchange, including
     the full v0.54 protocol request for user messages and result objects
     for assistant responses.
+
+    Messages are immutable once built; unknown keys in stored payloads are
+    ignored so older or newer records still load.
     """
 
     message_id: str = Field(
@@ -61,17 +78,8 @@ class ConversationMessage(BaseModel):
         description="Additional metadata (site, response_format, etc.)"
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "message_id": "msg_123456",
-                "conversation_id": "conv_abc123",
-                "role": "user",
-                "timestamp": "2025-01-15T10:30:00Z",
-                "request": {
-                    "query": {"text": "best pizza in Seattle"},
-                    "prefer": {"streaming": True, "response_format": "conv_search"}
-                },
-                "metadata": {"site": "yelp.com"}
-            }
-        }
+    model_config = ConfigDict(
+        frozen=True,
+        extra='ignore',
+        json_schema_extra={"example": _MESSAGE_EXAMPLE},
+    )
@@ -79,6 +79,9 @@ class ConversationStorageInterface(ABC):
 class ConversationStorageClient:
     """
     Client that routes to appropriate storage backend based on configuration.
+
+    The configured backend, and the client library it imports, is only
+    created on the first storage operation.
     """
 
     def __init__(self, backend: Optional[ConversationStorageInterface] = None):
@@ -87,12 +90,16 @@ class ConversationStorageClient:
 
         Args:
             backend: Optional backend override for testing. If not provided,
-                    creates backend from CONFIG.conversation_storage
+                    creates backend from CONFIG.conversation_storage on first use
         """
-        if backend is not None:
-            self.backend = backend
-        else:
-            self.backend = self._create_backend_from_config()
+        self._backend = backend
+
+    @property
+    def backend(self) -> ConversationStorageInterface:
+        """The storage backend, created from configuration on first access."""
+        if self._backend is None:
+            self._backend = self._create_backend_from_config()
+        return self._backend
 
     def _create_backend_from_config(self) -> ConversationStorageInterface:
         """
@@ -10,19 +10,200 @@ Backwards compatibility is not guaranteed at this time.
 
 from typing import Optional, List
 import asyncio
-import threading
+import hashlib
+import importlib
 
 from nlweb_core.config import CONFIG
+from nlweb_core.cache import TTLCache
 
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+
+# Texts longer than this are truncated before embedding to avoid token limit issues
+_EMBED_MAX_CHARS = 20000
+
+# Content-addressed cache of embedding vectors, keyed by text hash + provider + model
+EMBEDDING_CACHE_SIZE = 4096
+EMBEDDING_CACHE_TTL = 3600
+_embed_cache = TTLCache(max_size=EMBEDDING_CACHE_SIZE, ttl=EMBEDDING_CACHE_TTL)
+
+# In-flight provider calls per cache key, so concurrent misses for the same
+# text share one call and its result or error
+_embed_inflight = {}
+
+
+# Micro-batching of concurrent requests for providers with a batch_class_name configured
+EMBEDDING_BATCH_SIZE = 16
+EMBEDDING_BATCH_WINDOW = 0.01  # seconds to wait for more requests before flushing
+
+_batch_queues = {}
+
+
+class _BatchQueue:
+    """
+    Coalesces concurrent single-text embedding requests for one provider/model
+    into calls to the provider's batch embedding function.
+    """
+
+    def __init__(self, batch_callable, model_id: str):
+        self._batch_callable = batch_callable
+        self._model_id = model_id
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._full = asyncio.Event()
+        self._flusher = None
+        self._inflight = set()
+
+    async def submit(self, text: str, timeout: float) -> List[float]:
+        """Queue text for the next batch and wait for its embedding."""
+        future = self._loop.create_future()
+        self._queue.put_nowait((text, future, timeout))
+        if self._queue.qsize() >= EMBEDDING_BATCH_SIZE:
+            self._full.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        return await asyncio.wait_for(future, timeout=timeout)
+
+    async def _flush(self):
+        """Drain the queue in batches until it is empty."""
+        while not self._queue.empty():
+            if self._queue.qsize() < EMBEDDING_BATCH_SIZE:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=EMBEDDING_BATCH_WINDOW)
+                except asyncio.TimeoutError:
+                    pass
+            self._full.clear()
+
+            batch = []
+            while not self._queue.empty() and len(batch) < EMBEDDING_BATCH_SIZE:
+                batch.append(self._queue.get_nowait())
+
+            # Send the batch without blocking collection of the next one
+            task = asyncio.create_task(self._send(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _send(self, batch):
+        """Embed one batch and resolve each caller's future."""
+        texts = [text for text, _, _ in batch]
+        timeout = max(item_timeout for _, _, item_timeout in batch)
+        try:
+            vectors = await asyncio.wait_for(
+                self._batch_callable(texts, model=self._model_id),
+                timeout=timeout
+            )
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if len(vectors) != len(batch):
+            error = ValueError(
+                f"Batch embedding returned {len(vectors)} vectors for {len(batch)} texts"
+            )
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future, _), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+
+def _get_batch_queue(provider: str, provider_config, model_id: str) -> _BatchQueue:
+    """Return the batch queue for provider/model on the running event loop."""
+    key = (provider, model_id)
+    queue = _batch_queues.get(key)
+    if queue is None or queue._loop is not asyncio.get_running_loop():
+        batch_callable = _resolve(provider, provider_config.import_path, provider_config.batch_class_name)
+        queue = _BatchQueue(batch_callable, model_id)
+        _batch_queues[key] = queue
+    return queue
+
+
+# Provider callables resolved from config, keyed by (import_path, attribute name)
+_PROVIDER_FNS = {}
+
+# Provider modules imported so far, keyed by import_path
+_PROVIDER_MODULES = {}
+
+
+def _resolve(provider: str, import_path: str, name: str):
+    """
+    Import and return a provider callable, caching it after the first lookup
+    so the hot path is a dict lookup instead of a trip through the import system.
+    """
+    key = (import_path, name)
+    fn = _PROVIDER_FNS.get(key)
+    if fn is None:
+        try:
+            module = importlib.import_module(import_path)
+            fn = getattr(module, name)
+            _PROVIDER_MODULES[import_path] = module
+        except (ImportError, AttributeError) as e:
+            error_msg = f"Failed to load embedding provider '{provider}': {e}"
+            raise ValueError(error_msg)
+        _PROVIDER_FNS[key] = fn
+    return fn
+
+
+def _embedding_cache_key(text: str, provider: str, model_id: str) -> str:
+    """Build the cache key for a text/provider/model combination."""
+    data = text.encode("utf-8")
+    digest = _blake3(data).hexdigest() if _blake3 else hashlib.sha256(data).hexdigest()
+    return f"{digest}:{provider}:{model_id}"
+
+
+async def close_embedding_providers(*args) -> None:
+    """
+    Close clients held open by loaded provider modules. Safe to register as
+    an aiohttp on_cleanup hook.
+
+    Provider modules that keep a client between calls expose an async
+    close_embedder(); it is awaited for every provider module loaded so far.
+    """
+    for module in list(_PROVIDER_MODULES.values()):
+        close = getattr(module, "close_embedder", None)
+        if close is not None:
+            await close()
+
+
+def get_cached_embedding(
+    text: str,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    query_params: Optional[dict] = None
+) -> Optional[List[float]]:
+    """
+    Return the cached embedding for text without calling the provider.
+
+    Takes the same arguments as get_embedding and resolves provider and model
+    the same way.
+
+    Returns:
+        The embedding vector, or None if it is not cached or the provider is not configured
+    """
+    if CONFIG.is_development_mode() and query_params:
+        if 'embedding_provider' in query_params:
+            provider = query_params['embedding_provider']
+
+    provider = provider or CONFIG.preferred_embedding_provider
+    if provider not in CONFIG.embedding_providers:
+        return None
+    provider_config = CONFIG.get_embedding_provider(provider)
+    model_id = (model or provider_config.model) if provider_config else None
+    if not model_id:
+        return None
+
+    if len(text) > _EMBED_MAX_CHARS:
+        text = text[:_EMBED_MAX_CHARS]
+    return _embed_cache.get(_embedding_cache_key(text, provider, model_id))
 
-# Add locks for thread-safe provider access
-_provider_locks = {
-    "openai": threading.Lock(),
-    "gemini": threading.Lock(),
-    "azure_openai": threading.Lock(),
-    "snowflake": threading.Lock(),
-    "elasticsearch": threading.Lock()
-}
 
 async def get_embedding(
     text: str,
@@ -51,11 +232,9 @@ async def get_embedding(
 
     provider = provider or CONFIG.preferred_embedding_provider
 
-    # Truncate text to 20k characters to avoid token limit issues
-    MAX_CHARS = 20000
-    original_length = len(text)
-    if original_length > MAX_CHARS:
-        text = text[:MAX_CHARS]
+    # Truncate text to avoid token limit issues
+    if len(text) > _EMBED_MAX_CHARS:
+        text = text[:_EMBED_MAX_CHARS]
 
 
     if provider not in CONFIG.embedding_providers:
@@ -74,32 +253,47 @@ async def get_embedding(
         error_msg = f"No embedding model specified for provider '{provider}'"
         raise ValueError(error_msg)
 
+    cache_key = _embedding_cache_key(text, provider, model_id)
+    cached = _embed_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    call = _embed_inflight.get(cache_key)
+    if call is None:
+        call = asyncio.create_task(
+            _embed_and_cache(cache_key, provider, provider_config, text, model_id, timeout)
+        )
+        _embed_inflight[cache_key] = call
+    # Shielded so a cancelled caller does not cancel the call for the others
+    return await asyncio.shield(call)
+
 
+async def _embed_and_cache(cache_key, provider, provider_config, text, model_id, timeout):
+    """Run one shared get_embedding call and cache its result under cache_key."""
     try:
-        # Use config-driven dynamic import
-        if not provider_config.import_path or not provider_config.class_name:
-            error_msg = f"No import_path and class_name configured for embedding provider '{provider}'"
-            raise ValueError(error_msg)
+        result = await _call_provider(provider, provider_config, text, model_id, timeout)
+        _embed_cache.set(cache_key, result)
+        return result
+    finally:
+        _embed_inflight.pop(cache_key, None)
 
-        # Dynamic import based on config
-        import_path = provider_config.import_path
-        class_name = provider_config.class_name
 
-        try:
-            module = __import__(import_path, fromlist=[class_name])
-            embedding_callable = getattr(module, class_name)
+async def _call_provider(provider, provider_config, text, model_id, timeout):
+    """Dispatch a single embedding request to the configured provider."""
+    # Use config-driven dynamic import
+    if not provider_config.import_path or not provider_config.class_name:
+        error_msg = f"No import_path and class_name configured for embedding provider '{provider}'"
+        raise ValueError(error_msg)
 
-            # Call the embedding function with timeout
-            result = await asyncio.wait_for(
-                embedding_callable(text, model=model_id),
-                timeout=timeout
-            )
-            return result
-        except (ImportError, AttributeError) as e:
-            error_msg = f"Failed to load embedding provider '{provider}': {e}"
-            raise ValueError(error_msg)
+    # Coalesce concurrent requests when the provider exposes a batch endpoint
+    if provider_config.batch_class_name:
+        queue = _get_batch_queue(provider, provider_config, model_id)
+        return await queue.submit(text, timeout)
+
+    embedding_callable = _resolve(provider, provider_config.import_path, provider_config.class_name)
 
-    except asyncio.TimeoutError:
-        raise
-    except Exception as e:
-        raise
+    # Call the embedding function with timeout
+    return await asyncio.wait_for(
+        embedding_callable(text, model=model_id),
+        timeout=timeout
+    )
@@ -0,0 +1,65 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+Pooled HTTP client shared by model and retrieval providers.
+
+Providers that talk to REST endpoints directly should use get_http_client()
+instead of creating an httpx.AsyncClient per request, so that TCP connections
+and TLS sessions are kept alive and reused across calls. There is one client
+per event loop, since pooled connections cannot be used from another loop.
+
+WARNING: This code is under development and may undergo changes in future releases.
+Backwards compatibility is not guaranteed at this time.
+"""
+
+import asyncio
+import weakref
+from typing import Any
+
+# Keep-alive pool sizing for the shared client
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_TIMEOUT = 30.0
+
+# Shared clients keyed by event loop, dropped once their loop is garbage collected
+_http_clients = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> Any:
+    """
+    Get or lazily create the shared httpx.AsyncClient for the running event loop.
+
+    Must be called from a coroutine or task.
+
+    Returns:
+        The httpx.AsyncClient for the running loop
+
+    Raises:
+        ImportError: If httpx is not installed
+        RuntimeError: If no event loop is running
+    """
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        import httpx
+
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=DEFAULT_TIMEOUT,
+        )
+        _http_clients[loop] = client
+    return client
+
+
+async def close_http_client(*args) -> None:
+    """
+    Close the running loop's shared client. Safe to register as an aiohttp
+    on_cleanup hook.
+    """
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -16,7 +16,24 @@ Backwards compatibility is not guaranteed at this time.
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
 from nlweb_core.config import CONFIG
+from nlweb_core.cache import TTLCache
 import asyncio
+import copy
+import hashlib
+import logging
+import orjson
+import threading
+import weakref
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# asyncio.timeout (Python 3.11+) bounds a call without wrapping it in a task
+_asyncio_timeout = getattr(asyncio, "timeout", None)
 
 
 class LLMProvider(ABC):
@@ -92,23 +109,118 @@ class LLMProvider(ABC):
 # Cache for loaded providers
 _loaded_providers = {}
 
+# Per-llm_type locks so concurrent first-use callers share a single import
+_load_locks = weakref.WeakValueDictionary()
+
+# Guards imports into _loaded_providers from init() and from worker threads
+_import_lock = threading.Lock()
+
+# Context window sizes in tokens (prompt + completion). Prompts that cannot fit
+# are rejected before they are sent; unlisted models are not checked.
+MODEL_CONTEXT_TOKENS = {
+    "gpt-4.1": 1047576,
+    "gpt-4.1-mini": 1047576,
+    "gpt-4.1-nano": 1047576,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+}
+
+# tiktoken encodings keyed by model id, loaded by init(). Models without a
+# loaded encoding are not checked, so ask_llm never loads one itself.
+_encodings = {}
+
+# Endpoint/auth kwargs for get_completion, resolved once per model config.
+# Keyed by id() since config dataclasses are unhashable; the config is kept
+# alongside to detect a reused id.
+_connection_kwargs = {}
+
+# Cache of LLM responses, keyed by a hash of prompt, schema, model and limits
+LLM_CACHE_SIZE = 1024
+LLM_CACHE_TTL = 3600
+_llm_cache = TTLCache(max_size=LLM_CACHE_SIZE, ttl=LLM_CACHE_TTL)
+
+# In-flight calls per cache key, so concurrent identical requests share one
+# provider call and its result, failed or not
+_llm_inflight = {}
+
+# Failure counts per cache key. After LLM_FAILURE_LIMIT failed calls within
+# LLM_FAILURE_TTL seconds of each other, the request is not sent again until
+# the window expires.
+LLM_FAILURE_LIMIT = 3
+LLM_FAILURE_TTL = 30
+_llm_failures = TTLCache(max_size=LLM_CACHE_SIZE, ttl=LLM_FAILURE_TTL)
+
 
 def init():
-    """Initialize LLM providers based on configuration."""
-    # Get all configured LLM endpoints
-    for endpoint_name, endpoint_config in CONFIG.llm_endpoints.items():
-        llm_type = endpoint_config.llm_type
-        if llm_type and endpoint_name == CONFIG.preferred_llm_endpoint:
+    """
+    Load the providers used by ask_llm based on configuration.
+
+    Covers the high, low and scoring model tiers and the preferred endpoint,
+    and loads the tokenizers for their context-window checks. Call this at
+    process start so requests never pay for a provider import or a tokenizer load.
+    """
+    configs = [CONFIG.high_llm_model, CONFIG.low_llm_model, CONFIG.scoring_llm_model]
+    model_ids = [config.model for config in configs if config]
+    if CONFIG.preferred_llm_endpoint in CONFIG.llm_endpoints:
+        preferred = CONFIG.llm_endpoints[CONFIG.preferred_llm_endpoint]
+        configs.append(preferred)
+        if preferred.models:
+            model_ids += [preferred.models.high, preferred.models.low]
+
+    for provider_config in configs:
+        if provider_config and provider_config.llm_type:
             try:
-                # Use _get_provider which will load and cache the provider
-                _get_provider(llm_type, endpoint_config)
+                _load_provider(provider_config.llm_type, provider_config)
             except Exception as e:
                 pass
 
+    for model_id in model_ids:
+        _load_encoding(model_id)
 
-def _get_provider(llm_type: str, provider_config=None):
+
+def _load_encoding(model_id: str) -> None:
     """
-    Lazily load and return the provider for the given LLM type.
+    Load the tiktoken encoding for a model with a known context window.
+
+    Blocking: reads, and on first use may download, the BPE file.
+    """
+    if tiktoken is None or model_id not in MODEL_CONTEXT_TOKENS or model_id in _encodings:
+        return
+    try:
+        _encodings[model_id] = tiktoken.encoding_for_model(model_id)
+    except Exception:
+        # Unknown model, or the encoding file could not be fetched
+        pass
+
+
+async def prewarm(*args) -> None:
+    """
+    Run init() in a worker thread. Safe to register as an aiohttp on_startup hook.
+    """
+    await asyncio.to_thread(init)
+
+
+def _load_provider(llm_type: str, provider_config=None):
+    """
+    Return the cached provider for llm_type, importing it if it is missing.
+
+    Blocks on the import, under _import_lock so that init() and worker
+    threads never import the same provider twice.
+    """
+    with _import_lock:
+        provider = _loaded_providers.get(llm_type)
+        if provider is None:
+            provider = _import_provider(llm_type, provider_config)
+            _loaded_providers[llm_type] = provider
+        return provider
+
+
+def _import_provider(llm_type: str, provider_config=None):
+    """
+    Import and instantiate the provider for the given LLM type.
+
+    This blocks on the import system, so async callers should go through
+    _get_provider, which loads it in a worker thread.
 
     Args:
         llm_type: The type of LLM provider to load
@@ -120,10 +232,6 @@ def _get_provider(llm_type: str, provider_config=None):
     Raises:
         ValueError: If the LLM type is unknown
     """
-    # Return cached provider if already loaded
-    if llm_type in _loaded_providers:
-        return _loaded_providers[llm_type]
-
     # Use config-driven dynamic import if available
     if provider_config and provider_config.import_path and provider_config.class_name:
         try:
@@ -132,16 +240,55 @@ def _get_provider(llm_type: str, provider_config=None):
             module = __import__(import_path, fromlist=[class_name])
             provider_class = getattr(module, class_name)
             # Instantiate if it's a class, or use directly if it's already an instance
-            provider = provider_class() if callable(provider_class) else provider_class
-            _loaded_providers[llm_type] = provider
-        except (ImportError, AttributeError) as e:
-            raise ValueError(f"Failed to load provider for {llm_type}: {e}")
+            return provider_class() if callable(provider_class) else provider_class
+        except ImportError as e:
+            # Provider packages are installed ahead of time, never at request time
+            package = import_path.split(".", 1)[0].replace("_", "-")
+            raise ValueError(
+                f"Failed to load provider for {llm_type}: {e}. "
+                f"Install it with 'pip install {package}'"
+            ) from e
+        except AttributeError as e:
+            raise ValueError(f"Failed to load provider for {llm_type}: {e}") from e
     else:
         raise ValueError(
             f"No import_path and class_name configured for LLM type: {llm_type}"
         )
 
-    return _loaded_providers[llm_type]
+
+async def _get_provider(llm_type: str, provider_config=None):
+    """
+    Lazily load and return the provider for the given LLM type.
+
+    The first load runs in a worker thread so the event loop is not blocked
+    by the import, and is guarded by a per-type lock so that concurrent
+    callers wait for one load instead of each importing the provider.
+
+    Args:
+        llm_type: The type of LLM provider to load
+        provider_config: Optional provider config with import_path and class_name
+
+    Returns:
+        The provider instance
+
+    Raises:
+        ValueError: If the LLM type is unknown
+    """
+    # Return cached provider if already loaded
+    provider = _loaded_providers.get(llm_type)
+    if provider is not None:
+        return provider
+
+    lock = _load_locks.get(llm_type)
+    if lock is None:
+        lock = asyncio.Lock()
+        _load_locks[llm_type] = lock
+
+    async with lock:
+        provider = _loaded_providers.get(llm_type)
+        if provider is None:
+            provider = await asyncio.to_thread(_load_provider, llm_type, provider_config)
+    return provider
 
 
 async def ask_llm(
@@ -166,7 +313,10 @@ async def ask_llm(
         max_length: Maximum length of the response in tokens (default: 512)
 
     Returns:
-        Parsed JSON response from the LLM
+        Parsed JSON response from the LLM. Responses to calls without
+        query_params are cached per prompt, schema, model and max_length,
+        and such a call that keeps failing returns {} for a short while
+        without being sent.
 
     Raises:
         ValueError: If the endpoint is unknown or response cannot be parsed
@@ -206,53 +356,133 @@ async def ask_llm(
     else:
         return {}
 
+    if await _exceeds_context(prompt, model_id, max_length):
+        logger.warning("Prompt for %s does not fit its context window, not sending it", model_id)
+        return {}
+
+    if query_params:
+        # Per-request params are passed through to the provider and can change
+        # the answer, so these calls are not cached
+        return await _complete(
+            prompt, schema, llm_type, model_id, model_config, timeout, max_length, query_params
+        )
+
+    cache_key = _llm_cache_key(prompt, schema, llm_type, model_id, level, max_length)
+    cached = _llm_cache.get(cache_key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    # Don't repeat a request that keeps failing, e.g. by timing out
+    if _llm_failures.get(cache_key, 0) >= LLM_FAILURE_LIMIT:
+        return {}
+
+    call = _llm_inflight.get(cache_key)
+    if call is None:
+        call = asyncio.create_task(_complete_and_cache(
+            cache_key, prompt, schema, llm_type, model_id, model_config, timeout, max_length
+        ))
+        _llm_inflight[cache_key] = call
+    # Shielded so a cancelled caller does not cancel the call for the others
+    return copy.deepcopy(await asyncio.shield(call))
+
+
+async def _complete_and_cache(
+    cache_key, prompt, schema, llm_type, model_id, model_config, timeout, max_length
+):
+    """Run one shared ask_llm call and record its result under cache_key."""
+    try:
+        result = await _complete(
+            prompt, schema, llm_type, model_id, model_config, timeout, max_length, None
+        )
+        # Empty results mean the call failed; they are counted, not cached
+        if result:
+            _llm_cache.set(cache_key, result)
+            _llm_failures.pop(cache_key)
+        else:
+            _llm_failures.set(cache_key, _llm_failures.get(cache_key, 0) + 1)
+        return result
+    finally:
+        _llm_inflight.pop(cache_key, None)
+
+
+async def _exceeds_context(prompt: str, model_id: str, max_length: int) -> bool:
+    """
+    Check whether prompt plus max_length tokens is over the model's context window.
+
+    A token covers at least one byte and a character is at most four bytes, so
+    prompts shorter than a quarter of the window pass without being tokenized.
+    Longer prompts are tokenized in a worker thread. Returns False when the
+    model's window is unknown or init() did not load its encoding.
+    """
+    limit = MODEL_CONTEXT_TOKENS.get(model_id)
+    if limit is None or 4 * len(prompt) + max_length <= limit:
+        return False
+
+    encoding = _encodings.get(model_id)
+    if encoding is None:
+        return False
+    tokens = await asyncio.to_thread(encoding.encode, prompt, disallowed_special=())
+    return len(tokens) + max_length > limit
+
+
+def _llm_cache_key(prompt, schema, llm_type, model_id, level, max_length) -> str:
+    """Build the response cache key for an LLM request."""
+    data = orjson.dumps(
+        [prompt, schema, llm_type, model_id, level, max_length],
+        default=str,
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(data).hexdigest()
+
+
+async def _complete(
+    prompt, schema, llm_type, model_id, model_config, timeout, max_length, query_params
+) -> Dict[str, Any]:
+    """Send one request to the provider for llm_type, returning {} on failure."""
     try:
         # Get the provider instance based on llm_type
         try:
-            provider_instance = _get_provider(llm_type, model_config)
+            provider_instance = await _get_provider(llm_type, model_config)
         except ValueError as e:
             return {}
 
         # Simply call the provider's get_completion method, passing all config parameters
         # Each provider should handle thread-safety internally
-        result = await asyncio.wait_for(
-            provider_instance.get_completion(
-                prompt,
-                schema,
-                model=model_id,
-                timeout=timeout,
-                max_tokens=max_length,
-                endpoint=(
-                    model_config.endpoint if hasattr(model_config, "endpoint") else None
-                ),
-                api_key=(
-                    model_config.api_key if hasattr(model_config, "api_key") else None
-                ),
-                api_version=(
-                    model_config.api_version
-                    if hasattr(model_config, "api_version")
-                    else None
-                ),
-                auth_method=(
-                    model_config.auth_method
-                    if hasattr(model_config, "auth_method")
-                    else None
-                ),
-                **(query_params or {}),
-            ),
+        completion = provider_instance.get_completion(
+            prompt,
+            schema,
+            model=model_id,
             timeout=timeout,
+            max_tokens=max_length,
+            **_get_connection_kwargs(model_config),
+            **(query_params or {}),
         )
-        return result
+        if _asyncio_timeout is not None:
+            async with _asyncio_timeout(timeout):
+                return await completion
+        return await asyncio.wait_for(completion, timeout=timeout)
 
     except asyncio.TimeoutError:
+        logger.debug("LLM request to %s (%s) timed out after %ss", llm_type, model_id, timeout)
         return {}
-    except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+    except Exception:
+        logger.exception("LLM request to %s (%s) failed", llm_type, model_id)
         return {}
 
 
+def _get_connection_kwargs(model_config) -> Dict[str, Any]:
+    """Return the endpoint and auth kwargs passed to get_completion for a model config."""
+    entry = _connection_kwargs.get(id(model_config))
+    if entry is None or entry[0] is not model_config:
+        kwargs = {
+            name: getattr(model_config, name, None)
+            for name in ("endpoint", "api_key", "api_version", "auth_method")
+        }
+        entry = (model_config, kwargs)
+        _connection_kwargs[id(model_config)] = entry
+    return entry[1]
+
+
 def get_available_providers() -> list:
     """
     Get a list of LLM providers that have their required API keys available.
@@ -10,8 +10,82 @@ Backwards compatibility is not guaranteed at this time.
 """
 
 import asyncio
+import hashlib
+import math
+from typing import List, Optional
+from nlweb_core.cache import TTLCache
+from nlweb_core.embedding import get_cached_embedding
 from nlweb_core.llm import ask_llm
-from nlweb_core.utils import fill_prompt_variables
+
+
+# Semantic cache of summaries, so paraphrased queries over the same results reuse one
+SUMMARY_CACHE_SIZE = 1024
+SUMMARY_CACHE_TTL = 3600
+SUMMARY_SIMILARITY_THRESHOLD = 0.92
+SUMMARY_CACHE_ENTRIES_PER_RESULTS = 8
+
+
+def _split_prompt(prompt_str: str):
+    """Split a summarize prompt around its {request.query} and {results} placeholders."""
+    prefix, rest = prompt_str.split("{request.query}", 1)
+    mid, suffix = rest.split("{results}", 1)
+    return prefix, mid, suffix
+
+
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    """Cosine similarity of two vectors, 0.0 if either is all zeros."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _results_key(results: List[dict]) -> str:
+    """Hash the urls (or names, when missing) of a result set, ignoring order."""
+    ids = sorted(str(result.get('url') or result.get('name', '')) for result in results)
+    return hashlib.sha256("\n".join(ids).encode("utf-8")).hexdigest()
+
+
+class SemanticSummaryCache:
+    """
+    Summaries keyed by the results they were built from, matched by query similarity.
+
+    A summary is only reused for the same set of result items, and for a query
+    whose embedding is within the similarity threshold of the cached query.
+    """
+
+    def __init__(
+        self,
+        max_size: int = SUMMARY_CACHE_SIZE,
+        ttl: Optional[float] = SUMMARY_CACHE_TTL,
+        threshold: float = SUMMARY_SIMILARITY_THRESHOLD,
+    ):
+        """
+        Args:
+            max_size: Maximum number of distinct result sets kept
+            ttl: Time-to-live in seconds for a result set's summaries
+            threshold: Minimum cosine similarity between queries for a hit
+        """
+        self.threshold = threshold
+        self._entries = TTLCache(max_size=max_size, ttl=ttl)
+
+    def get(self, results_key: str, embedding: List[float]) -> Optional[str]:
+        """Return a cached summary for a similar query over these results, if any."""
+        for cached_embedding, summary in self._entries.get(results_key, ()):
+            if _cosine_similarity(embedding, cached_embedding) >= self.threshold:
+                return summary
+        return None
+
+    def set(self, results_key: str, embedding: List[float], summary: str) -> None:
+        """Store the summary generated for a query over these results."""
+        entries = self._entries.get(results_key)
+        if entries is None:
+            entries = []
+            self._entries.set(results_key, entries)
+        entries.append((embedding, summary))
+        del entries[:-SUMMARY_CACHE_ENTRIES_PER_RESULTS]
+
+
+_summary_cache = SemanticSummaryCache()
 
 
 class PostQueryProcessing:
@@ -24,6 +98,9 @@ Results:
         {"summary": "A 2-3 sentence summary of the results"}
     ]
 
+    # Prompt text around the query and results, split once so each call is one f-string
+    _PROMPT_PARTS = _split_prompt(SUMMARIZE_RESULTS_PROMPT[0])
+
     def __init__(self, handler):
         self.handler = handler
 
@@ -46,28 +123,53 @@ Results:
         top_results = results[:3]
 
         # Build results text for prompt
-        results_text = []
-        for i, result in enumerate(top_results, 1):
-            name = result.get('name', 'Unknown')
-            description = result.get('description', '')
-            results_text.append(f"{i}. {name}: {description}")
-
-        # Prepare prompt variables
-        prompt_vars = {
-            "request.query": self.handler.query.text,
-            "results": "\n".join(results_text)
-        }
-
-        prompt_str, schema = self.SUMMARIZE_RESULTS_PROMPT
-        prompt = fill_prompt_variables(prompt_str, {}, prompt_vars)
+        results_text = "\n".join(
+            f"{i}. {result.get('name', 'Unknown')}: {result.get('description', '')}"
+            for i, result in enumerate(top_results, 1)
+        )
+
+        # Reuse the summary of a similar earlier query over the same results.
+        # Keyed on the items' identity, not results_text: ranking writes a
+        # fresh description for every request.
+        results_key = _results_key(top_results)
+        query_embedding = self._query_embedding()
+        if query_embedding is not None:
+            summary = _summary_cache.get(results_key, query_embedding)
+            if summary is not None:
+                await self._send_summary(summary)
+                return
+
+        prefix, mid, suffix = self._PROMPT_PARTS
+        prompt = f"{prefix}{self.handler.query.text}{mid}{results_text}{suffix}"
+        schema = self.SUMMARIZE_RESULTS_PROMPT[1]
 
         # Call LLM for summarization
         response = await ask_llm(prompt, schema, level='high', timeout=20)
 
         if response and 'summary' in response:
-            # Send summary as a v0.54 result
-            summary_result = {
-                '@type': 'Summary',
-                'text': response['summary']
-            }
-            await self.handler.send_results([summary_result])
+            if query_embedding is not None:
+                _summary_cache.set(results_key, query_embedding, response['summary'])
+            await self._send_summary(response['summary'])
+
+    def _query_embedding(self) -> Optional[List[float]]:
+        """
+        Return the query embedding for the summary cache, if it is already cached.
+
+        Uses the same text and params as vector retrieval so its embedding is
+        reused. The provider is never called, so the summary does not wait on
+        embeddings; without a cached embedding the semantic cache is skipped.
+        """
+        query = self.handler.query
+        text = getattr(query, 'decontextualized_text', None) or query.text
+        try:
+            return get_cached_embedding(text, query_params=getattr(self.handler, 'query_params', None))
+        except Exception:
+            return None
+
+    async def _send_summary(self, summary: str):
+        """Send summary as a v0.54 result."""
+        summary_result = {
+            '@type': 'Summary',
+            'text': summary
+        }
+        await self.handler.send_results([summary_result])
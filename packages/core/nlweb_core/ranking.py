@@ -8,15 +8,18 @@ WARNING: This code is under development and may undergo changes in future releas
 Backwards compatibility is not guaranteed at this time.
 """
 
-from nlweb_core.utils import trim_json, fill_prompt_variables
+from nlweb_core.utils import jsonify, trim_json, fill_prompt_variables
 from nlweb_core.llm import ask_llm
+from nlweb_core.config import CONFIG
 import asyncio
-import json
+import heapq
+import logging
+import sys
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Any, Dict, Optional
 
-
-def log(message):
-    """Simple logging function."""
-    pass
+logger = logging.getLogger(__name__)
 
 
 # Schema.org markup trimming utilities
@@ -180,6 +183,45 @@ def trim_schema_json_item(schema_json, site):
             return retval
 
 
+# __slots__ on dataclasses needs Python 3.10+
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class RankedAnswer:
+    """A scored item, plus the schema.org attributes sent along with it."""
+
+    url: str
+    name: str
+    site: str
+    score: int
+    description: str
+    type: str = "Item"
+    extra: Dict[str, Any] = field(default_factory=dict)
+    grounding: Optional[str] = None
+    sent: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Build the result dict sent to the client.
+
+        Schema attributes in extra take precedence over the basic fields,
+        and grounding is added last when present.
+        """
+        result = {
+            "@type": self.type,
+            "url": self.url,
+            "name": self.name,
+            "site": self.site,
+            "score": self.score,
+            "description": self.description,
+        }
+        result.update(self.extra)
+        if self.grounding:
+            result["grounding"] = self.grounding
+        return result
+
+
 class Ranking:
 
     EARLY_SEND_THRESHOLD = 69
@@ -208,70 +250,98 @@ The user's question is: {request.query}. The item's description is {item.descrip
     def __init__(self, handler, items, level="low"):
         self.handler = handler
         self.level = level
-        self.items = items
+        # Parse each item's schema JSON once up front; trim_json and the result
+        # building in rankItem both work on the parsed object
+        self.items = [
+            (url, jsonify(json_str), name, site) for url, json_str, name, site in items
+        ]
         self.num_results_sent = 0
         self.rankedAnswers = []
+        # Bound the number of in-flight LLM calls; excess items wait here
+        self._sem = asyncio.Semaphore(CONFIG.ranking_concurrency or 16)
+        # Scoring tasks keyed by filled prompt, so items with identical
+        # descriptions in this request share a single LLM call
+        self._rank_cache = {}
+
+        # The prompt and answer structure are the same for every item in the
+        # request, so resolve them once. Populate the keys needed by the prompt
+        # template ({request.query} and {site.itemType}) and pre-fill everything
+        # except {item.description}, which is the only per-item variable.
+        self._prompt_str, self._ans_struc = self.get_ranking_prompt()
+        self.handler.query_params["request.query"] = self.handler.query
+        self.handler.query_params["site.itemType"] = (
+            "item"  # Default to "item" if not specified
+        )
+        self._prompt_template = fill_prompt_variables(
+            self._prompt_str,
+            {
+                k: v
+                for k, v in self.handler.query_params.items()
+                if k != "item.description"
+            },
+        )
 
-    async def rankItem(self, url, json_str, name, site):
-        try:
-            prompt_str, ans_struc = self.get_ranking_prompt()
-            description = trim_json(json_str)
-
-            # Populate the missing keys needed by the prompt template
-            # The prompt template uses {request.query} and {site.itemType}
-            self.handler.query_params["request.query"] = self.handler.query
-            self.handler.query_params["site.itemType"] = (
-                "item"  # Default to "item" if not specified
-            )
-            self.handler.query_params["item.description"] = description
-
-            prompt = fill_prompt_variables(
-                prompt_str, self.handler.query_params, {"item.description": description}
-            )
-            # Use 'scoring' level for ranking tasks
-            ranking = await ask_llm(
+    def _score(self, prompt, query_params):
+        """
+        Get the scoring task for a prompt, starting it if this is the first request.
+
+        Args:
+            prompt: The filled ranking prompt for one item
+            query_params: Per-item query parameters passed through to ask_llm
+
+        Returns:
+            An awaitable resolving to the LLM's ranking dict
+        """
+        task = self._rank_cache.get(prompt)
+        if task is None:
+            task = asyncio.ensure_future(self._ask_llm(prompt, query_params))
+            self._rank_cache[prompt] = task
+        return task
+
+    async def _ask_llm(self, prompt, query_params):
+        # Use 'scoring' level for ranking tasks
+        async with self._sem:
+            return await ask_llm(
                 prompt,
-                ans_struc,
+                self._ans_struc,
                 level="scoring",
-                query_params=self.handler.query_params,
+                query_params=query_params,
             )
 
-            # Handle both string and dictionary inputs for json_str
-            schema_object = (
-                json_str if isinstance(json_str, dict) else json.loads(json_str)
+    async def rankItem(self, url, schema_object, name, site):
+        try:
+            description = trim_json(schema_object)
+
+            prompt = fill_prompt_variables(
+                self._prompt_template, {"item.description": description}
             )
+            # Give each item its own params so concurrent items don't overwrite
+            # each other's description in the shared handler dict
+            item_params = {**self.handler.query_params, "item.description": description}
+            ranking = await self._score(prompt, item_params)
 
             # If schema_object is an array, set it to the first item
             if isinstance(schema_object, list) and len(schema_object) > 0:
                 schema_object = schema_object[0]
 
-            # Create the final result structure
-            # Start with basic fields
-            result = {
-                "@type": schema_object.get("@type", "Item"),
-                "url": url,
-                "name": name,
-                "site": site,
-                "score": ranking.get("score", 0),
-                "description": ranking.get("description", ""),
-                "sent": False,
-            }
-
-            # Add all attributes from schema_object except url
-            for key, value in schema_object.items():
-                if key != "url":
-                    result[key] = value
-
-            # Add grounding with the url or @id from schema_object
-            grounding_url = schema_object.get("url") or schema_object.get("@id")
-            if grounding_url:
-                result["grounding"] = grounding_url
-
-            # Add to ranked answers
-            self.rankedAnswers.append(result)
+            # Create the final result structure, carrying all attributes from
+            # schema_object except url, and grounding with its url or @id
+            answer = RankedAnswer(
+                url=url,
+                name=name,
+                site=site,
+                score=ranking.get("score", 0),
+                description=ranking.get("description", ""),
+                type=schema_object.get("@type", "Item"),
+                extra={k: v for k, v in schema_object.items() if k != "url"},
+                grounding=schema_object.get("url") or schema_object.get("@id"),
+            )
+
+            # Add to ranked answers, keeping the score alongside as the sort key
+            self.rankedAnswers.append((answer.score, answer))
 
             # Send immediately if score is high enough
-            if result["score"] > self.EARLY_SEND_THRESHOLD:
+            if answer.score > self.EARLY_SEND_THRESHOLD:
                 try:
                     if not self.handler.connection_alive_event.is_set():
                         return
@@ -286,8 +356,8 @@ The user's question is: {request.query}. The item's description is {item.descrip
 
                     # Check if we can still send more results
                     if self.num_results_sent < max_results:
-                        await self.handler.send_results([result])
-                        result["sent"] = True
+                        await self.handler.send_results([answer.to_dict()])
+                        answer.sent = True
                         self.num_results_sent += 1
 
                 except (BrokenPipeError, ConnectionResetError):
@@ -295,12 +365,7 @@ The user's question is: {request.query}. The item's description is {item.descrip
                     return
 
         except Exception as e:
-            import traceback
-
-            traceback.print_exc()
-            # Import here to avoid circular import
-            from nlweb_core.config import CONFIG
-
+            logger.exception("Error ranking item %s", url)
             if CONFIG.should_raise_exceptions():
                 raise  # Re-raise in testing/development mode
 
@@ -318,7 +383,7 @@ The user's question is: {request.query}. The item's description is {item.descrip
         )
 
         # Filter unsent results
-        unsent = [r for r in answers if not r["sent"]]
+        unsent = [a for a in answers if not a.sent]
 
         # Calculate how many more we can send
         remaining_slots = max_results - self.num_results_sent
@@ -332,34 +397,38 @@ The user's question is: {request.query}. The item's description is {item.descrip
         if to_send:
             try:
                 # Send each result using send_results
-                for i, result in enumerate(to_send):
-                    # Create a copy without the 'sent' field for sending (keep score)
-                    result_to_send = {k: v for k, v in result.items() if k != "sent"}
-                    await self.handler.send_results([result_to_send])
-                    result["sent"] = True
+                for answer in to_send:
+                    await self.handler.send_results([answer.to_dict()])
+                    answer.sent = True
                     self.num_results_sent += 1
             except (BrokenPipeError, ConnectionResetError) as e:
                 self.handler.connection_alive_event.clear()
             except Exception as e:
-                import traceback
-
-                traceback.print_exc()
+                logger.exception("Error sending remaining answers")
                 self.handler.connection_alive_event.clear()
 
     async def do(self):
         tasks = []
-        for url, json_str, name, site in self.items:
+        for url, schema_object, name, site in self.items:
             if (
                 self.handler.connection_alive_event.is_set()
             ):  # Only add new tasks if connection is still alive
                 tasks.append(
-                    asyncio.create_task(self.rankItem(url, json_str, name, site))
+                    asyncio.create_task(self.rankItem(url, schema_object, name, site))
                 )
 
-        try:
-            await asyncio.gather(*tasks, return_exceptions=True)
-        except Exception as e:
-            return
+        # Consume items in completion order so a disconnect is noticed as soon as
+        # any item finishes, rather than after the slowest one
+        for fut in asyncio.as_completed(tasks):
+            try:
+                await fut
+            except Exception as e:
+                # rankItem reports its own errors; keep collecting the rest
+                pass
+            if not self.handler.connection_alive_event.is_set():
+                for task in tasks:
+                    task.cancel()
+                return
 
         if not self.handler.connection_alive_event.is_set():
             return
@@ -374,14 +443,17 @@ The user's question is: {request.query}. The item's description is {item.descrip
             "max_results", int, self.NUM_RESULTS_TO_SEND
         )
 
-        # Filter and sort by score
-        filtered = [r for r in self.rankedAnswers if r["score"] > min_score_threshold]
-
-        ranked = sorted(filtered, key=lambda x: x["score"], reverse=True)
-        self.handler.final_ranked_answers = ranked[:max_results]
+        # Keep the top max_results above the threshold, highest score first
+        top = heapq.nlargest(
+            max_results,
+            (entry for entry in self.rankedAnswers if entry[0] > min_score_threshold),
+            key=itemgetter(0),
+        )
+        ranked = [answer for _, answer in top]
+        self.handler.final_ranked_answers = [answer.to_dict() for answer in ranked]
 
         # Send remaining unsent results (only send up to max_results)
         try:
-            await self.sendRemainingAnswers(ranked[:max_results])
+            await self.sendRemainingAnswers(ranked)
         except (BrokenPipeError, ConnectionResetError):
             self.handler.connection_alive_event.clear()
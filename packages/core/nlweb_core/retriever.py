@@ -9,33 +9,88 @@ This module provides abstract base classes and concrete implementations for data
 import os
 import time
 import asyncio
+import importlib
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Union, Tuple, Type
 import json
 from nlweb_core.config import CONFIG
 
-# Client cache for reusing instances
-_client_cache = {}
+# Client caches for reusing instances: VectorDBClient wrappers keyed by requested
+# endpoint name, and provider clients keyed by db_type and endpoint. Lookups
+# are lock-free; the lock only guards creation on a cache miss.
+_wrapper_cache = {}
+_provider_cache = {}
 _client_cache_lock = asyncio.Lock()
 
-# Preloaded client modules
-_preloaded_modules = {}
+# Client classes imported so far, keyed by (import_path, class_name)
+_client_classes = {}
+
+# First enabled endpoint with valid credentials, resolved once from CONFIG
+_default_endpoint = None
 
 def init():
-    """Initialize retrieval clients based on configuration."""
-    # Preload modules for enabled endpoints using config-driven dynamic imports
-    for endpoint_name, endpoint_config in CONFIG.retrieval_endpoints.items():
-        if endpoint_config.enabled and endpoint_config.import_path and endpoint_config.class_name:
-            try:
-                # Preload using config
-                import_path = endpoint_config.import_path
-                class_name = endpoint_config.class_name
-                module = __import__(import_path, fromlist=[class_name])
-                client_class = getattr(module, class_name)
-                _preloaded_modules[endpoint_config.db_type] = client_class
-            except Exception as e:
-                # Silently skip preload failures - will load on demand
-                pass
+    """
+    Initialize retrieval clients based on configuration.
+
+    Provider modules are no longer preloaded here: most deployments use a single
+    backend, so each client class is imported on first use by get_client().
+    The default endpoint is resolved up front.
+    """
+    _get_default_endpoint()
+
+
+def _get_default_endpoint() -> Optional[str]:
+    """
+    Get the first enabled endpoint with valid credentials, resolving it on first use.
+
+    Returns:
+        The endpoint name, or None if no endpoint qualifies
+    """
+    global _default_endpoint
+    if _default_endpoint is None:
+        _default_endpoint = next(
+            (name for name, config in CONFIG.retrieval_endpoints.items()
+             if config.enabled and _has_valid_credentials(config)),
+            None
+        )
+    return _default_endpoint
+
+
+def _has_valid_credentials(config) -> bool:
+    """
+    Check if an endpoint has valid credentials.
+
+    Args:
+        config: Endpoint configuration
+
+    Returns:
+        True if endpoint has required credentials
+    """
+    # Generic credential validation, independent of db_type:
+    # - database_path means local file-based storage
+    # - api_endpoint means remote storage (api_key is optional for most providers)
+    # - import_path alone means the provider may not need credentials
+    return bool(config.database_path or config.api_endpoint or config.import_path)
+
+
+def _load_client_class(import_path: str, class_name: str) -> Type:
+    """
+    Import and cache a retrieval client class.
+
+    Args:
+        import_path: Module path of the client
+        class_name: Name of the client class in that module
+
+    Returns:
+        The client class
+    """
+    key = (import_path, class_name)
+    client_class = _client_classes.get(key)
+    if client_class is None:
+        module = importlib.import_module(import_path)
+        client_class = getattr(module, class_name)
+        _client_classes[key] = client_class
+    return client_class
 
 
 class VectorDBClientInterface(ABC):
@@ -82,10 +137,7 @@ class VectorDBClient:
         # Require an endpoint name
         if not endpoint_name:
             # Use first enabled endpoint with valid credentials
-            for name, config in CONFIG.retrieval_endpoints.items():
-                if config.enabled and self._has_valid_credentials(name, config):
-                    endpoint_name = name
-                    break
+            endpoint_name = _get_default_endpoint()
 
             if not endpoint_name:
                 raise ValueError("No endpoint specified and no enabled endpoints with valid credentials found")
@@ -108,30 +160,16 @@ class VectorDBClient:
         
     def _has_valid_credentials(self, name: str, config) -> bool:
         """
-        Check if an endpoint has valid credentials based on its database type.
-        
+        Check if an endpoint has valid credentials.
+
         Args:
             name: Endpoint name
             config: Endpoint configuration
-            
+
         Returns:
             True if endpoint has required credentials
         """
-        db_type = config.db_type
-        
-        # Generic credential validation:
-        # - If has database_path, assume local storage (always valid)
-        # - Otherwise, check for api_endpoint (remote storage needs endpoint)
-        # - api_key is optional for most providers
-        if config.database_path:
-            return True  # Local file-based storage
-        elif config.api_endpoint:
-            return True  # Remote storage with endpoint
-        elif config.import_path:
-            # If import_path is configured, assume it's valid (provider may not need credentials)
-            return True
-        else:
-            return False
+        return _has_valid_credentials(config)
     
     async def get_client(self) -> VectorDBClientInterface:
         """
@@ -144,23 +182,22 @@ class VectorDBClient:
         # Use cache key combining db_type and endpoint
         cache_key = f"{self.db_type}_{self.endpoint_name}"
 
-        # Check if client already exists in cache
+        # Fast path: cached clients are returned without taking the lock
+        client = _provider_cache.get(cache_key)
+        if client is not None:
+            return client
+
         async with _client_cache_lock:
-            if cache_key in _client_cache:
-                return _client_cache[cache_key]
+            # Re-check under the lock in case another coroutine created it first
+            if cache_key in _provider_cache:
+                return _provider_cache[cache_key]
 
             # Create the appropriate client using config-driven dynamic import
             try:
-                # Use preloaded module if available
-                if self.db_type in _preloaded_modules:
-                    client_class = _preloaded_modules[self.db_type]
-                # Otherwise use config to dynamically import
-                elif self.endpoint_config.import_path and self.endpoint_config.class_name:
-                    # Dynamic import based on config
-                    import_path = self.endpoint_config.import_path
-                    class_name = self.endpoint_config.class_name
-                    module = __import__(import_path, fromlist=[class_name])
-                    client_class = getattr(module, class_name)
+                if self.endpoint_config.import_path and self.endpoint_config.class_name:
+                    client_class = _load_client_class(
+                        self.endpoint_config.import_path, self.endpoint_config.class_name
+                    )
                 else:
                     error_msg = f"No import_path and class_name configured for: {self.db_type}"
                     raise ValueError(error_msg)
@@ -168,10 +205,17 @@ class VectorDBClient:
                 # Instantiate the client
                 client = client_class(self.endpoint_name)
             except ImportError as e:
-                raise ValueError(f"Failed to load client for {self.db_type}: {e}")
+                # Provider packages are installed ahead of time, never at request time
+                package = self.endpoint_config.import_path.split(".", 1)[0].replace("_", "-")
+                raise ValueError(
+                    f"Failed to load client for {self.db_type}: {e}. "
+                    f"Install it with 'pip install {package}'"
+                ) from e
+            except AttributeError as e:
+                raise ValueError(f"Failed to load client for {self.db_type}: {e}") from e
 
             # Store in cache and return
-            _client_cache[cache_key] = client
+            _provider_cache[cache_key] = client
             return client
     
     
@@ -195,33 +239,39 @@ class VectorDBClient:
 
 
 # Factory function to make it easier to get a client with the right type
-def get_vector_db_client(endpoint_name: Optional[str] = None, 
-                        query_params: Optional[Dict[str, Any]] = None) -> VectorDBClient:
+async def get_vector_db_client(endpoint_name: Optional[str] = None,
+                               query_params: Optional[Dict[str, Any]] = None) -> VectorDBClient:
     """
     Factory function to create a vector database client with the appropriate configuration.
     Uses a global cache to avoid repeated initialization and site queries.
-    
+
     Args:
         endpoint_name: Optional name of the endpoint to use
         query_params: Optional query parameters for overriding endpoint
-        
+
     Returns:
         Configured VectorDBClient instance (cached if possible)
     """
-    global _client_cache
-    
     # Create a cache key based on endpoint_name
-    # Note: We don't include query_params in the key since they're typically the same
+    # Note: query_params are not part of the key. They carry the per-request query,
+    # so keying on them would create a wrapper per request, and the endpoint is
+    # resolved from endpoint_name and config alone.
     cache_key = endpoint_name or 'default'
-    
-    # Check if we have a cached client
-    if cache_key in _client_cache:
-        return _client_cache[cache_key]
-    
-    # Create a new client and cache it
-    client = VectorDBClient(endpoint_name=endpoint_name, query_params=query_params)
-    _client_cache[cache_key] = client
-    
+
+    # Fast path: cached wrappers are returned without taking the lock
+    client = _wrapper_cache.get(cache_key)
+    if client is not None:
+        return client
+
+    async with _client_cache_lock:
+        # Re-check under the lock in case another coroutine created it first
+        if cache_key in _wrapper_cache:
+            return _wrapper_cache[cache_key]
+
+        # Create a new client and cache it
+        client = VectorDBClient(endpoint_name=endpoint_name, query_params=query_params)
+        _wrapper_cache[cache_key] = client
+
     return client
 
 
@@ -252,10 +302,8 @@ async def search(query: str,
     Example:
         results = await search("climate change", site="example.com", num_results=5)
     """
-    client = get_vector_db_client(endpoint_name=endpoint_name, query_params=query_params)
+    client = await get_vector_db_client(endpoint_name=endpoint_name, query_params=query_params)
 
     return await client.search(query, site, num_results, **kwargs)
-    
-    return results
 
 
@@ -13,6 +13,9 @@ import asyncio
 from aiohttp import web
 from nlweb_core.NLWebVectorDBRankingHandler import NLWebVectorDBRankingHandler
 from nlweb_core.config import CONFIG
+from nlweb_core.embedding import close_embedding_providers
+from nlweb_core.http_client import close_http_client
+from nlweb_core.llm import prewarm as prewarm_llm_providers
 from nlweb_core.utils import get_param
 from pydantic import ValidationError
 from nlweb_core.protocol import AskRequest, AskResponse, ResponseMeta
@@ -418,6 +421,13 @@ def create_app():
     """Create and configure the aiohttp application."""
     app = web.Application()
 
+    # Load LLM providers before the first request instead of during it
+    app.on_startup.append(prewarm_llm_providers)
+
+    # Release pooled provider connections on shutdown
+    app.on_cleanup.append(close_http_client)
+    app.on_cleanup.append(close_embedding_providers)
+
     # Add routes - support both GET and POST for /ask
     app.router.add_get('/ask', ask_handler)
     app.router.add_post('/ask', ask_handler)
@@ -5,9 +5,10 @@
 Common utility functions used across NLWeb.
 """
 
-import json
 from typing import Any, Dict, List, Union
 
+import orjson
+
 
 def get_param(query_params, param_name, param_type=str, default_value=None):
     """
@@ -51,8 +52,8 @@ def jsonify(obj):
     """Convert a string to JSON object if it's a JSON string, otherwise return as-is."""
     if isinstance(obj, str):
         try:
-            obj = json.loads(obj)
-        except json.JSONDecodeError:
+            obj = orjson.loads(obj)
+        except orjson.JSONDecodeError:
             return obj
     return obj
 
@@ -0,0 +1,45 @@
+"""
+Tests for the in-process TTL cache.
+"""
+
+from nlweb_core import cache
+from nlweb_core.cache import TTLCache
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    c = TTLCache(max_size=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1
+    c.set("c", 3)
+
+    assert c.get("b") is None
+    assert c.get("a") == 1
+    assert c.get("c") == 3
+
+
+def test_ttl_expiry(monkeypatch):
+    """Test that entries expire after their TTL."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+
+    c = TTLCache(max_size=10, ttl=60)
+    c.set("a", 1)
+    c.set("b", 2, ttl=5)
+
+    now[0] += 10
+    assert c.get("a") == 1
+    assert c.get("b") is None
+
+    now[0] += 60
+    assert c.get("a") is None
+
+
+def test_contains_counts_cached_none():
+    """Test that a cached None is reported as present, matching get."""
+    c = TTLCache(max_size=10)
+    c.set("a", None)
+
+    assert "a" in c
+    assert "b" not in c
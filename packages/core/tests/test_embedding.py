@@ -0,0 +1,112 @@
+"""
+Tests for the embedding wrapper.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from nlweb_core import embedding
+
+
+def test_concurrent_identical_requests_share_one_call(monkeypatch):
+    """Test that duplicate texts are embedded once and then served from cache."""
+    calls = []
+
+    async def fake_call_provider(provider, provider_config, text, model_id, timeout):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        return [0.1, 0.2]
+
+    monkeypatch.setattr(embedding, "_call_provider", fake_call_provider)
+    embedding._embed_cache.clear()
+
+    async def run():
+        results = await asyncio.gather(
+            *[embedding.get_embedding("same text") for _ in range(5)]
+        )
+        results.append(await embedding.get_embedding("same text"))
+        return results
+
+    results = asyncio.run(run())
+
+    assert calls == ["same text"]
+    assert all(r == [0.1, 0.2] for r in results)
+
+
+def test_concurrent_requests_share_one_failure(monkeypatch):
+    """Test that a failed provider call is raised to every waiter without a retry."""
+    calls = []
+
+    async def fake_call_provider(provider, provider_config, text, model_id, timeout):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        raise asyncio.TimeoutError()
+
+    monkeypatch.setattr(embedding, "_call_provider", fake_call_provider)
+    embedding._embed_cache.clear()
+
+    async def run():
+        return await asyncio.gather(
+            *[embedding.get_embedding("failing text") for _ in range(5)],
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert calls == ["failing text"]
+    assert all(isinstance(r, asyncio.TimeoutError) for r in results)
+    assert embedding._embed_inflight == {}
+
+
+def test_batch_queue_coalesces_concurrent_requests():
+    """Test that concurrent requests are sent to the batch callable together."""
+    batches = []
+
+    async def fake_batch(texts, model=None):
+        batches.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+    async def run():
+        queue = embedding._BatchQueue(fake_batch, "model")
+        return await asyncio.gather(*[queue.submit(t, timeout=5) for t in ["a", "bb", "ccc"]])
+
+    results = asyncio.run(run())
+
+    assert batches == [["a", "bb", "ccc"]]
+    assert results == [[1.0], [2.0], [3.0]]
+
+
+def test_close_embedding_providers_closes_loaded_modules(monkeypatch):
+    """Test that shutdown awaits close_embedder on provider modules that define it."""
+    closed = []
+
+    async def close_embedder():
+        closed.append("elastic")
+
+    monkeypatch.setattr(embedding, "_PROVIDER_MODULES", {
+        "elastic": SimpleNamespace(close_embedder=close_embedder),
+        "openai": SimpleNamespace(),
+    })
+
+    asyncio.run(embedding.close_embedding_providers())
+
+    assert closed == ["elastic"]
+
+
+def test_get_cached_embedding_only_reads_the_cache(monkeypatch):
+    """Test that get_cached_embedding returns cached vectors and never calls the provider."""
+    calls = []
+
+    async def fake_call_provider(provider, provider_config, text, model_id, timeout):
+        calls.append(text)
+        return [0.3, 0.4]
+
+    monkeypatch.setattr(embedding, "_call_provider", fake_call_provider)
+    embedding._embed_cache.clear()
+
+    assert embedding.get_cached_embedding("seen before") is None
+    asyncio.run(embedding.get_embedding("seen before"))
+
+    assert embedding.get_cached_embedding("seen before") == [0.3, 0.4]
+    assert embedding.get_cached_embedding("never embedded") is None
+    assert calls == ["seen before"]
@@ -0,0 +1,35 @@
+"""
+Tests for the shared HTTP client.
+"""
+
+import asyncio
+
+from nlweb_core import http_client
+
+
+def test_each_event_loop_gets_its_own_client():
+    """Test that a new event loop does not reuse a client bound to a closed loop."""
+    async def get_client():
+        return http_client.get_http_client()
+
+    async def get_client_twice():
+        return http_client.get_http_client(), http_client.get_http_client()
+
+    first = asyncio.run(get_client())
+    second, again = asyncio.run(get_client_twice())
+
+    assert second is not first
+    assert again is second
+
+
+def test_close_http_client_closes_the_running_loops_client():
+    """Test that closing drops the client so the next call creates a new one."""
+    async def run():
+        client = http_client.get_http_client()
+        await http_client.close_http_client()
+        return client, http_client.get_http_client()
+
+    closed, replacement = asyncio.run(run())
+
+    assert closed.is_closed
+    assert replacement is not closed
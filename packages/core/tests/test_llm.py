@@ -0,0 +1,166 @@
+"""
+Tests for LLM provider loading and request routing.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from nlweb_core import llm
+
+
+def test_concurrent_first_use_loads_provider_once(monkeypatch):
+    """Test that concurrent callers share a single provider import."""
+    imports = []
+
+    def fake_import_provider(llm_type, provider_config=None):
+        imports.append(llm_type)
+        return object()
+
+    monkeypatch.setattr(llm, "_import_provider", fake_import_provider)
+    monkeypatch.setattr(llm, "_loaded_providers", {})
+
+    async def run():
+        return await asyncio.gather(*[llm._get_provider("fake") for _ in range(5)])
+
+    providers = asyncio.run(run())
+
+    assert imports == ["fake"]
+    assert all(p is providers[0] for p in providers)
+
+
+def test_identical_requests_share_one_call(monkeypatch):
+    """Test that identical requests are sent once and then served from cache."""
+    calls = []
+
+    async def fake_complete(prompt, schema, *args):
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return {"summary": "cached"}
+
+    model = SimpleNamespace(model="fake-model", llm_type="fake")
+    monkeypatch.setattr(
+        llm, "CONFIG",
+        SimpleNamespace(high_llm_model=model, low_llm_model=None, scoring_llm_model=None),
+    )
+    monkeypatch.setattr(llm, "_complete", fake_complete)
+    llm._llm_cache.clear()
+
+    async def run():
+        results = await asyncio.gather(
+            *[llm.ask_llm("same prompt", {"summary": "string"}, level="high") for _ in range(5)]
+        )
+        results.append(await llm.ask_llm("same prompt", {"summary": "string"}, level="high"))
+        return results
+
+    results = asyncio.run(run())
+
+    assert calls == ["same prompt"]
+    assert all(r == {"summary": "cached"} for r in results)
+
+
+def test_concurrent_failing_requests_share_one_call(monkeypatch):
+    """Test that waiters get the leader's failed result instead of retrying in turn."""
+    calls = []
+
+    async def fake_complete(prompt, schema, *args):
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return {}
+
+    model = SimpleNamespace(model="fake-model", llm_type="fake")
+    monkeypatch.setattr(
+        llm, "CONFIG",
+        SimpleNamespace(high_llm_model=model, low_llm_model=None, scoring_llm_model=None),
+    )
+    monkeypatch.setattr(llm, "_complete", fake_complete)
+    llm._llm_cache.clear()
+    llm._llm_failures.clear()
+
+    async def run():
+        return await asyncio.gather(
+            *[llm.ask_llm("failing prompt", {"summary": "string"}, level="high") for _ in range(5)]
+        )
+
+    results = asyncio.run(run())
+
+    assert calls == ["failing prompt"]
+    assert all(r == {} for r in results)
+    assert llm._llm_inflight == {}
+
+
+class FakeEncoding:
+    """Tokenizer stub: one token per character, recording each prompt it encodes."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, text, disallowed_special=()):
+        self.encoded.append(text)
+        return list(text)
+
+
+def test_short_prompts_skip_the_tokenizer(monkeypatch):
+    """Test that prompts well inside the context window are never tokenized."""
+    encoding = FakeEncoding()
+    monkeypatch.setitem(llm.MODEL_CONTEXT_TOKENS, "tiny-model", 100)
+    monkeypatch.setitem(llm._encodings, "tiny-model", encoding)
+
+    assert not asyncio.run(llm._exceeds_context("x" * 20, "tiny-model", 10))
+    assert encoding.encoded == []
+
+    assert asyncio.run(llm._exceeds_context("x" * 95, "tiny-model", 10))
+    assert encoding.encoded == ["x" * 95]
+
+
+def test_over_limit_prompt_is_not_sent(monkeypatch):
+    """Test that ask_llm returns {} for an over-limit prompt without calling the provider."""
+    calls = []
+
+    async def fake_complete(prompt, schema, *args):
+        calls.append(prompt)
+        return {"summary": "sent"}
+
+    model = SimpleNamespace(model="tiny-model", llm_type="fake")
+    monkeypatch.setattr(
+        llm, "CONFIG",
+        SimpleNamespace(high_llm_model=model, low_llm_model=None, scoring_llm_model=None),
+    )
+    monkeypatch.setattr(llm, "_complete", fake_complete)
+    monkeypatch.setitem(llm.MODEL_CONTEXT_TOKENS, "tiny-model", 100)
+    monkeypatch.setitem(llm._encodings, "tiny-model", FakeEncoding())
+    llm._llm_cache.clear()
+    llm._llm_failures.clear()
+
+    result = asyncio.run(llm.ask_llm("x" * 95, {"summary": "string"}, level="high", max_length=10))
+
+    assert result == {}
+    assert calls == []
+
+
+def test_repeated_failures_stop_sending_requests(monkeypatch):
+    """Test that a request that keeps failing is not sent again within the window."""
+    calls = []
+
+    async def fake_complete(prompt, schema, *args):
+        calls.append(prompt)
+        return {}
+
+    model = SimpleNamespace(model="fake-model", llm_type="fake")
+    monkeypatch.setattr(
+        llm, "CONFIG",
+        SimpleNamespace(high_llm_model=model, low_llm_model=None, scoring_llm_model=None),
+    )
+    monkeypatch.setattr(llm, "_complete", fake_complete)
+    llm._llm_cache.clear()
+    llm._llm_failures.clear()
+
+    async def run():
+        return [
+            await llm.ask_llm("failing prompt", {"summary": "string"}, level="high")
+            for _ in range(llm.LLM_FAILURE_LIMIT + 2)
+        ]
+
+    results = asyncio.run(run())
+
+    assert len(calls) == llm.LLM_FAILURE_LIMIT
+    assert all(r == {} for r in results)
@@ -0,0 +1,104 @@
+"""
+Tests for post-query processing.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from nlweb_core import postQueryProcessing
+from nlweb_core.postQueryProcessing import PostQueryProcessing, SemanticSummaryCache
+
+
+def test_summary_reused_for_similar_query():
+    """Test that a similar query over the same results hits the cache."""
+    c = SemanticSummaryCache(threshold=0.9)
+    c.set("results", [1.0, 0.0], "summary")
+
+    assert c.get("results", [0.99, 0.05]) == "summary"
+    assert c.get("results", [0.0, 1.0]) is None
+
+
+def test_summary_not_reused_for_other_results():
+    """Test that summaries are never shared between different result sets."""
+    c = SemanticSummaryCache(threshold=0.9)
+    c.set("results", [1.0, 0.0], "summary")
+
+    assert c.get("other results", [1.0, 0.0]) is None
+
+
+class FakeHandler:
+    """Minimal handler exposing what PostQueryProcessing reads and writes."""
+
+    def __init__(self, query_text, descriptions=("Vietnamese noodle soup", "Spicy Thai soups")):
+        self.query = SimpleNamespace(text=query_text, decontextualized_text=None)
+        self.query_params = {}
+        self.modes = ['summarize']
+        self.final_ranked_answers = [
+            {"url": "https://example.com/pho-bac", "name": "Pho Bac", "description": descriptions[0]},
+            {"url": "https://example.com/tom-yum", "name": "Tom Yum House", "description": descriptions[1]},
+        ]
+        self.sent = []
+
+    async def send_results(self, results):
+        self.sent.extend(results)
+
+
+def _patch_summarize(monkeypatch, embeddings):
+    """Stub ask_llm and the embedding cache; return the list of LLM prompts."""
+    prompts = []
+
+    async def fake_ask_llm(prompt, schema, **kwargs):
+        prompts.append(prompt)
+        return {"summary": "Two soup spots."}
+
+    monkeypatch.setattr(postQueryProcessing, "ask_llm", fake_ask_llm)
+    monkeypatch.setattr(
+        postQueryProcessing, "get_cached_embedding",
+        lambda text, **kwargs: embeddings.get(text),
+    )
+    monkeypatch.setattr(postQueryProcessing, "_summary_cache", SemanticSummaryCache(threshold=0.9))
+    return prompts
+
+
+def test_summarize_reuses_summary_for_similar_query(monkeypatch):
+    """Test that a paraphrased query over the same results skips the LLM."""
+    prompts = _patch_summarize(monkeypatch, {
+        "soup near me": [1.0, 0.0],
+        "soup places nearby": [0.99, 0.05],
+    })
+
+    first = FakeHandler("soup near me")
+    second = FakeHandler("soup places nearby")
+    asyncio.run(PostQueryProcessing(first).summarize_results())
+    asyncio.run(PostQueryProcessing(second).summarize_results())
+
+    assert len(prompts) == 1
+    assert first.sent == second.sent == [{'@type': 'Summary', 'text': "Two soup spots."}]
+
+
+def test_summarize_ignores_ranking_descriptions(monkeypatch):
+    """Test that paraphrased queries share a summary when ranking describes the same items differently."""
+    prompts = _patch_summarize(monkeypatch, {
+        "soup near me": [1.0, 0.0],
+        "soup places nearby": [0.99, 0.05],
+    })
+
+    first = FakeHandler("soup near me")
+    second = FakeHandler("soup places nearby", descriptions=("Pho and banh mi", "Thai hot and sour soup"))
+    asyncio.run(PostQueryProcessing(first).summarize_results())
+    asyncio.run(PostQueryProcessing(second).summarize_results())
+
+    assert len(prompts) == 1
+    assert second.sent == [{'@type': 'Summary', 'text': "Two soup spots."}]
+
+
+def test_summarize_without_cached_embedding_calls_llm(monkeypatch):
+    """Test that a query with no cached embedding goes straight to the LLM."""
+    prompts = _patch_summarize(monkeypatch, {})
+
+    for _ in range(2):
+        handler = FakeHandler("soup near me")
+        asyncio.run(PostQueryProcessing(handler).summarize_results())
+        assert handler.sent == [{'@type': 'Summary', 'text': "Two soup spots."}]
+
+    assert len(prompts) == 2
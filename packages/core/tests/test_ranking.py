@@ -0,0 +1,84 @@
+"""
+Tests for the ranking stage.
+"""
+
+import asyncio
+
+from nlweb_core import ranking
+from nlweb_core.ranking import RankedAnswer, Ranking
+
+
+class FakeHandler:
+    """Minimal handler exposing what Ranking reads and writes."""
+
+    def __init__(self):
+        self.query = "spicy soup"
+        self.query_params = {}
+        self.sent = []
+        self.final_ranked_answers = None
+        self.connection_alive_event = asyncio.Event()
+        self.connection_alive_event.set()
+        self.pre_checks_done_event = asyncio.Event()
+        self.pre_checks_done_event.set()
+
+    def get_param(self, name, param_type=str, default_value=None):
+        return default_value
+
+    async def send_results(self, results):
+        self.sent.extend(results)
+
+
+def test_duplicate_items_are_scored_once(monkeypatch):
+    """Test that items with identical descriptions share one LLM call."""
+    prompts = []
+
+    async def fake_ask_llm(prompt, schema, level="low", query_params=None, **kwargs):
+        prompts.append(prompt)
+        await asyncio.sleep(0.01)
+        return {"score": 80, "description": "relevant"}
+
+    monkeypatch.setattr(ranking, "ask_llm", fake_ask_llm)
+
+    soup = '{"@type": "Recipe", "name": "Soup"}'
+    items = [
+        ("https://a.example/soup", soup, "Soup", "a"),
+        ("https://b.example/soup", soup, "Soup", "b"),
+        ("https://c.example/stew", '{"@type": "Recipe", "name": "Stew"}', "Stew", "c"),
+    ]
+
+    async def run():
+        handler = FakeHandler()
+        await Ranking(handler, items).do()
+        return handler
+
+    handler = asyncio.run(run())
+
+    assert len(prompts) == 2
+    assert sorted(r["url"] for r in handler.final_ranked_answers) == [
+        "https://a.example/soup",
+        "https://b.example/soup",
+        "https://c.example/stew",
+    ]
+    assert all("sent" not in r for r in handler.sent)
+    assert len(handler.sent) == 3
+
+
+def test_ranked_answer_to_dict_lets_schema_attributes_win():
+    """Test that schema attributes override basic fields and grounding comes last."""
+    answer = RankedAnswer(
+        url="https://a.example/soup",
+        name="Soup",
+        site="a",
+        score=80,
+        description="relevant",
+        type="Recipe",
+        extra={"@type": "Recipe", "name": "Spicy Soup", "recipeYield": "4"},
+        grounding="https://a.example/soup",
+    )
+
+    result = answer.to_dict()
+
+    assert result["name"] == "Spicy Soup"
+    assert result["score"] == 80
+    assert "sent" not in result
+    assert list(result)[-1] == "grounding"
@@ -18,6 +18,9 @@ formatting while routing to the appropriate NLWeb handler.
 
 from aiohttp import web
 from nlweb_core.config import CONFIG
+from nlweb_core.embedding import close_embedding_providers
+from nlweb_core.http_client import close_http_client
+from nlweb_core.llm import prewarm as prewarm_llm_providers
 from nlweb_core.NLWebVectorDBRankingHandler import NLWebVectorDBRankingHandler
 from nlweb_core.utils import get_param
 from nlweb_network.interfaces import (
@@ -183,6 +186,13 @@ def create_app():
     """Create and configure the aiohttp application."""
     app = web.Application()
 
+    # Load LLM providers before the first request instead of during it
+    app.on_startup.append(prewarm_llm_providers)
+
+    # Release pooled provider connections on shutdown
+    app.on_cleanup.append(close_http_client)
+    app.on_cleanup.append(close_embedding_providers)
+
     # Add HTTP routes
     app.router.add_get('/ask', ask_handler)
     app.router.add_post('/ask', ask_handler)
@@ -21,9 +21,10 @@ from nlweb_core.llm import LLMProvider
 class AzureOpenAIProvider(LLMProvider):
     """Implementation of LLMProvider for Azure OpenAI."""
     
-    # Global client with thread-safe initialization
+    # Clients keyed by (endpoint, api_version, auth_method, api_key) with
+    # thread-safe initialization, so each endpoint keeps one connection pool
     _client_lock = threading.Lock()
-    _client = None
+    _clients: Dict[tuple, AsyncAzureOpenAI] = {}
 
 
     @classmethod
@@ -106,11 +107,15 @@ class AzureOpenAIProvider(LLMProvider):
             error_msg = "Missing required Azure OpenAI configuration (endpoint or api_version)"
             raise ValueError(error_msg)
 
-        # For parameter-based calls, create a new client each time (no caching)
-        with cls._client_lock:  # Thread-safe client initialization
-            if cls._client is None or endpoint != cls.get_azure_endpoint():
-                # Create new client
+        # One client per distinct configuration, reused across calls
+        key = (endpoint, api_version, auth_method, api_key)
+        client = cls._clients.get(key)
+        if client is not None:
+            return client
 
+        with cls._client_lock:  # Thread-safe client initialization
+            client = cls._clients.get(key)
+            if client is None:
                 try:
                     if auth_method == "azure_ad":
                         token_provider = get_bearer_token_provider(
@@ -118,7 +123,7 @@ class AzureOpenAIProvider(LLMProvider):
                             "https://cognitiveservices.azure.com/.default"
                         )
 
-                        cls._client = AsyncAzureOpenAI(
+                        client = AsyncAzureOpenAI(
                             azure_endpoint=endpoint,
                             azure_ad_token_provider=token_provider,
                             api_version=api_version,
@@ -129,7 +134,7 @@ class AzureOpenAIProvider(LLMProvider):
                             error_msg = "Missing required Azure OpenAI API key for api_key authentication"
                             raise ValueError(error_msg)
 
-                        cls._client = AsyncAzureOpenAI(
+                        client = AsyncAzureOpenAI(
                             azure_endpoint=endpoint,
                             api_key=api_key,
                             api_version=api_version,
@@ -142,8 +147,9 @@ class AzureOpenAIProvider(LLMProvider):
                 except Exception as e:
                     return None
 
+                cls._clients[key] = client
 
-        return cls._client
+        return client
 
     @classmethod
     def clean_response(cls, content: str) -> Dict[str, Any]:
@@ -11,6 +11,7 @@ import time
 import uuid
 from typing import List, Dict, Union, Optional, Any
 
+import httpx
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models
 
@@ -102,6 +103,12 @@ class QdrantClient(VectorDBClientInterface):
             params["url"] = url
             if api_key:
                 params["api_key"] = api_key
+            # Size the REST connection pool if configured
+            pool_size = self.endpoint_config.pool_size
+            if pool_size:
+                params["limits"] = httpx.Limits(
+                    max_connections=pool_size, max_keepalive_connections=pool_size
+                )
         elif path:
             # Resolve relative paths for local file-based storage
             resolved_path = self._resolve_path(path)
@@ -25,6 +25,7 @@ def mock_config():
     endpoint_config.api_key = "test_api_key"
     endpoint_config.database_path = None
     endpoint_config.index_name = "test_collection"
+    endpoint_config.pool_size = None
     
     config.retrieval_endpoints = {"test_endpoint": endpoint_config}
     
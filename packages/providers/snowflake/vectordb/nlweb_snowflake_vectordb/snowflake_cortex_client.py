@@ -8,7 +8,7 @@ Provides read-only access to Snowflake Cortex Search Services for hybrid
 vector and keyword search capabilities.
 """
 
-import json
+import orjson
 import httpx
 from typing import List, Dict, Union, Optional, Any, Tuple
 
@@ -297,6 +297,6 @@ class SnowflakeCortexClient(VectorDBClientInterface):
             Name extracted from schema, or empty string if not found
         """
         try:
-            return json.loads(schema_json).get("name", "")
+            return orjson.loads(schema_json).get("name", "")
         except Exception:
             return ""